@@ -1,8 +1,17 @@
 import os, json, requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Keep-alive session so bursts of notifications reuse one TLS connection.
+# POST is retried explicitly; urllib3 only retries idempotent methods by default.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=Retry(
+    total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=frozenset({"POST"}))))
+
 def post_approval_message(payload: dict, match: dict):
     url = os.getenv("SLACK_WEBHOOK_URL", "")
     if not url: 
         print("[warn] SLACK_WEBHOOK_URL not set; skipping Slack")
         return
     text = f"Invoice {payload['invoice_no']} from {payload['vendor']} • Match: {match['matched']}"
-    requests.post(url, json={"text": text})
+    _session.post(url, json={"text": text}, timeout=5)
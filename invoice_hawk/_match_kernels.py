@@ -0,0 +1,113 @@
+"""
+Numeric kernels for the two-way match.
+
+``lines_within_tol`` walks parallel float64 arrays of invoice and PO
+quantities/prices and stops at the first line outside tolerance.  When
+Numba is installed the loop is JIT-compiled to native code; ``HAVE_NUMBA``
+tells callers whether the compiled version is available.  Numba is only
+imported, and the kernel compiled, on the first vectorized match, so
+importing this module stays cheap for small invoices and Lambda cold
+starts.  The compiled kernel is cached on disk when Numba's cache location
+(``__pycache__`` next to this file, or ``NUMBA_CACHE_DIR``) is writable.
+
+``line_arrays`` and ``lines_match`` are the array path shared by the CLI
+and the po_lookup Lambda: callers with at least ``VECTORIZE_MIN_LINES``
+lines (and NumPy installed, see ``HAVE_NUMPY``) marshal once and match
+without a per-line Python loop.
+"""
+
+import importlib.util
+import os
+
+try:
+    # NumPy is optional; it only pays off for invoices with many lines.
+    import numpy as np  # type: ignore
+except Exception:
+    np = None  # type: ignore
+
+# Numba is optional; without it callers use the NumPy-vectorised path.
+# Finding the spec is cheap, importing numba is not, so that waits until
+# the kernel is first needed.
+HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+
+HAVE_NUMPY = np is not None
+
+# Below this many lines, building arrays costs more than the Python loop.
+VECTORIZE_MIN_LINES = 20
+
+
+def _lines_within_tol(inv_q, inv_p, po_q, po_p, qty_tol, price_tol):
+    for i in range(inv_q.shape[0]):
+        # Tolerances are relative to the invoice values (zero when the value is zero).
+        q_t = qty_tol * inv_q[i] if inv_q[i] else 0.0
+        p_t = price_tol * inv_p[i] if inv_p[i] else 0.0
+        if not (abs(inv_q[i] - po_q[i]) <= q_t and abs(inv_p[i] - po_p[i]) <= p_t):
+            return False
+    return True
+
+
+_compiled = None
+
+
+def _numba_cache_writable() -> bool:
+    if os.environ.get("NUMBA_CACHE_DIR"):
+        return True
+    here = os.path.dirname(os.path.abspath(__file__))
+    pycache = os.path.join(here, "__pycache__")
+    # On Lambda the package directory is read-only; caching would fail there.
+    return os.access(pycache if os.path.isdir(pycache) else here, os.W_OK)
+
+
+def _compiled_kernel():
+    global _compiled
+    if _compiled is None:
+        try:
+            from numba import njit  # type: ignore
+
+            _compiled = njit(cache=_numba_cache_writable(), boundscheck=False, error_model="numpy")(
+                _lines_within_tol
+            )
+        except Exception:
+            # A broken Numba install should not break matching.
+            _compiled = _lines_within_tol
+    return _compiled
+
+
+def lines_within_tol(inv_q, inv_p, po_q, po_p, qty_tol, price_tol):
+    kernel = _compiled_kernel() if HAVE_NUMBA else _lines_within_tol
+    return kernel(inv_q, inv_p, po_q, po_p, qty_tol, price_tol)
+
+
+def line_arrays(invoice_lines, po_lines):
+    """Invoice and PO quantities/prices as float64 arrays, one per column.
+
+    ``invoice_lines`` are objects with ``quantity``/``price`` (ORM rows or
+    stand-ins; Decimal prices are coerced), ``po_lines`` are NetSuite dicts.
+    Only the first ``len(invoice_lines)`` PO lines are used.
+    """
+    n = len(invoice_lines)
+    inv_q = np.fromiter((li.quantity for li in invoice_lines), dtype=np.float64, count=n)
+    inv_p = np.fromiter((float(li.price) for li in invoice_lines), dtype=np.float64, count=n)
+    po_q = np.fromiter((p.get("quantity", 0) for p in po_lines[:n]), dtype=np.float64, count=n)
+    po_p = np.fromiter((p.get("price", 0) for p in po_lines[:n]), dtype=np.float64, count=n)
+    return inv_q, inv_p, po_q, po_p
+
+
+def lines_match(inv_qty, inv_price, po_qty, po_price, qty_tol, price_tol) -> bool:
+    """True if every line is within the invoice-relative tolerances."""
+    if HAVE_NUMBA:
+        return bool(_compiled_kernel()(inv_qty, inv_price, po_qty, po_price, qty_tol, price_tol))
+    # Same invoice-relative tolerances as the scalar loop (zero when the invoice value is zero).
+    qty_ok = np.abs(inv_qty - po_qty) <= qty_tol * inv_qty
+    price_ok = np.abs(inv_price - po_price) <= price_tol * inv_price
+    return bool((qty_ok & price_ok).all())
+
+
+__all__ = [
+    "HAVE_NUMBA",
+    "HAVE_NUMPY",
+    "VECTORIZE_MIN_LINES",
+    "line_arrays",
+    "lines_match",
+    "lines_within_tol",
+]
@@ -11,45 +11,77 @@ AWS Lambda; here they are combined for convenience.
 from __future__ import annotations
 
 import argparse
+import fnmatch
 import glob
-import json
+import mmap
 import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 
-from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
-from .models import Base, Invoice, LineItem, AuditLog
+from ._match_kernels import HAVE_NUMPY, VECTORIZE_MIN_LINES, line_arrays, lines_match
+from .models import Base, Invoice, LineItem, AuditLog, create_db_engine
 from .ocr_provider import get_provider
 from .netsuite_client import NetSuiteClient
-from .utils import send_slack_message
+from .utils import json_dumps, send_slack_message, upload_file_to_s3 as _upload_file_to_s3
 
 from datetime import date, datetime
-import json, os, re
+import os, re
 
 # Tolerance constants (matching those in po_lookup/main.py)
 PRICE_TOLERANCE = 0.02
 QTY_TOLERANCE = 0.01
 
+# PDFs larger than this are memory-mapped for OCR instead of copied into a bytes object.
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+# S3 key helpers run once per archived invoice; compile their patterns once.
+_KEY_RE = re.compile(r"[^A-Za-z0-9]+")
+_SLUG_RE = re.compile(r"[^A-Za-z0-9_-]+")
+_DUP_RE = re.compile(r"__+")
+# ASCII fast path for _KEY_RE: bytes.translate maps every non-alphanumeric
+# byte to "_" in one C-level pass (str.translate with a dict is no faster
+# than the regex).
+_KEY_TABLE = bytes(c if chr(c).isascii() and chr(c).isalnum() else ord("_") for c in range(256))
+
+
+# Slack webhooks are fire-and-forget; post them off the critical path so a
+# slow round-trip never holds up OCR/matching of the next file.
+_slack_queue = ThreadPoolExecutor(max_workers=8, thread_name_prefix="slack")
+
+
+def _log_slack_failure(fut: Future) -> None:
+    exc = fut.exception()
+    if exc is not None:
+        print(f"[warn] Slack notification failed: {exc}")
+
 
 # --- test hook: monkeypatched by tests ---
-def upload_file_to_s3(content: bytes, bucket: str, key: str, content_type: str) -> None:
+def upload_file_to_s3(content: bytes | Path, bucket: str, key: str, content_type: str) -> None:
     """
-    Minimal stub so tests can monkeypatch this function.
-    Real impl can call boto3.client('s3').put_object(...).
+    Archive hook so tests can monkeypatch this function.
+    ``content`` may be bytes or a local path; paths are streamed from disk.
     """
-    return
+    _upload_file_to_s3(content, bucket, key, content_type=content_type)
 
 def _inv_key(s: str | None) -> str:
     # Preserve letters but force UPPERCASE; replace separators with underscores
-    import re
-    return re.sub(r"[^A-Za-z0-9]+", "_", (s or "unknown")).strip("_").upper()
+    return _vendor_key(s).upper()
 
 def _vendor_key(s: str | None) -> str:
     # Preserve case; replace spaces, slashes, hyphens, etc. with underscores
-    import re
-    return re.sub(r"[^A-Za-z0-9]+", "_", (s or "unknown")).strip("_")
+    s = s or "unknown"
+    if not s.isascii():
+        # The translate table only covers ASCII; non-ASCII letters must become "_" too.
+        return _KEY_RE.sub("_", s).strip("_")
+    s = s.encode("ascii").translate(_KEY_TABLE).decode("ascii")
+    if "__" in s:
+        s = _DUP_RE.sub("_", s)
+    return s.strip("_")
 
 def _as_date(value) -> date | None:
     if isinstance(value, date):
@@ -62,19 +94,26 @@ def _as_date(value) -> date | None:
     return None
 
 def _slug(s: str) -> str:
-    return re.sub(r"[^A-Za-z0-9_-]+", "-", (s or "unknown")).strip("-").lower()
+    return _SLUG_RE.sub("-", (s or "unknown")).strip("-").lower()
 
 def compare_lines(invoice_lines: Iterable[LineItem], po_lines: Iterable[dict]) -> bool:
-    for i, inv_li in enumerate(invoice_lines):
-        try:
-            po_li = list(po_lines)[i]
-        except IndexError:
-            return False
+    # Callers usually pass lists already (ORM collections, po.get("lines", [])).
+    if not isinstance(invoice_lines, list):
+        invoice_lines = list(invoice_lines)
+    if not isinstance(po_lines, list):
+        po_lines = list(po_lines)
+    if len(invoice_lines) > len(po_lines):
+        return False
+    if HAVE_NUMPY and len(invoice_lines) >= VECTORIZE_MIN_LINES:
+        return lines_match(*line_arrays(invoice_lines, po_lines), QTY_TOLERANCE, PRICE_TOLERANCE)
+    for inv_li, po_li in zip(invoice_lines, po_lines):
+        inv_qty = inv_li.quantity
+        inv_price = float(inv_li.price)
         # Compute tolerance thresholds relative to the invoice values rather than the PO.
-        qty_tol = QTY_TOLERANCE * inv_li.quantity if inv_li.quantity else 0
-        price_tol = PRICE_TOLERANCE * float(inv_li.price) if inv_li.price else 0
-        qty_ok = abs(inv_li.quantity - po_li.get("quantity", 0)) <= qty_tol
-        price_ok = abs(float(inv_li.price) - po_li.get("price", 0)) <= price_tol
+        qty_tol = QTY_TOLERANCE * inv_qty if inv_qty else 0
+        price_tol = PRICE_TOLERANCE * inv_price if inv_price else 0
+        qty_ok = abs(inv_qty - po_li.get("quantity", 0)) <= qty_tol
+        price_ok = abs(inv_price - po_li.get("price", 0)) <= price_tol
         if not (qty_ok and price_ok):
             return False
     return True
@@ -94,14 +133,21 @@ def persist_invoice(session, extracted: dict):
         status="NEW",
     )
     session.add(invoice)
-    session.flush()
-    session.commit()
+    session.flush()  # assigns invoice.id; the caller commits
     return invoice
 
 
-def process_file(path: Path, session: Session, provider, netsuite: NetSuiteClient, slack_webhook: str | None) -> None:
-    content = path.read_bytes()
-    extracted = provider.extract_fields(content)
+def _extract(path: Path, provider) -> dict:
+    if path.stat().st_size <= MMAP_THRESHOLD:
+        return provider.extract_fields(path.read_bytes())
+    # Large scans: hand the provider a read-only view of the page cache
+    # rather than a private copy of the whole file.
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return provider.extract_fields(mm)
+
+
+def process_file(path: Path, session: Session, provider, netsuite: NetSuiteClient, slack_webhook: str | None) -> dict:
+    extracted = _extract(path, provider)
 
     # persist
     invoice = persist_invoice(session, extracted)
@@ -112,10 +158,9 @@ def process_file(path: Path, session: Session, provider, netsuite: NetSuiteClien
     invoice.status = "matched" if within else "flagged"
     session.add(AuditLog(invoice=invoice, event_type="po_check",
                          details={"within_tolerance": within, "po_data": po}))
-    session.commit()
-    print(f"Processed {path.name}: matched={within}")
 
     # Slack notification (optional)
+    slack_message = None
     if slack_webhook:
         text = f"Invoice {invoice.invoice_number} from {invoice.vendor}: {'matched' if within else 'flagged'}"
         actions = [
@@ -144,10 +189,18 @@ def process_file(path: Path, session: Session, provider, netsuite: NetSuiteClien
                 "actions": actions,
             }
         ]
-        send_slack_message(slack_webhook, text, attachments=attachments)
+        slack_message = (text, attachments)
         invoice.status = "awaiting_approval"
-        session.add(AuditLog(invoice=invoice, event_type="slack_notification", details={"sent": True}))
-        session.commit()
+        session.add(AuditLog(invoice=invoice, event_type="slack_notification", details={"queued": True}))
+
+    # One commit per invoice for the insert, match result and notification audit.
+    invoice_id = invoice.id
+    session.commit()
+    if slack_message:
+        # Only notify once the invoice the buttons refer to is committed.
+        text, attachments = slack_message
+        fut = _slack_queue.submit(send_slack_message, slack_webhook, text, attachments=attachments)
+        fut.add_done_callback(_log_slack_failure)
 
     # --- archive to S3 (tests monkeypatch upload_file_to_s3) ---
     bucket = os.getenv("ARCHIVE_BUCKET")
@@ -164,10 +217,71 @@ def process_file(path: Path, session: Session, provider, netsuite: NetSuiteClien
         raw_key  = f"raw/{yyyy}/{mm}/{dd}/{vendor}/{invno}.pdf"
         json_key = f"json/{yyyy}/{mm}/{dd}/{vendor}/{invno}.json"
 
-        # use the bytes we already read from `path`
-        upload_file_to_s3(content, bucket, raw_key,  "application/pdf")
-        upload_file_to_s3(json.dumps(extracted).encode("utf-8"), bucket, json_key, "application/json")
+        # stream the PDF from disk rather than holding a second copy in memory
+        upload_file_to_s3(path, bucket, raw_key,  "application/pdf")
+        upload_file_to_s3(json_dumps(extracted), bucket, json_key, "application/json")
+
+    return {"file": path.name, "invoice_id": invoice_id, "matched": within}
+
+
+@lru_cache(maxsize=None)
+def _worker_context(db_url: str):
+    """Per-process engine, OCR provider and NetSuite client.
+
+    SQLAlchemy sessions and connection pools must not cross process
+    boundaries, so each worker builds its own on first use and reuses them
+    for every file it is handed.
+    """
+    engine = create_db_engine(db_url)
+    return engine, get_provider(), NetSuiteClient()
+
+
+def process_one(path_str: str, db_url: str, slack_webhook: str | None) -> dict:
+    """Process a single PDF in a worker process and return its result."""
+    engine, provider, netsuite = _worker_context(db_url)
+    with Session(engine) as session:
+        return process_file(Path(path_str), session, provider, netsuite, slack_webhook)
+
+
+def _worker_count() -> int:
+    return max(1, int(os.environ.get("INVOICE_HAWK_WORKERS") or os.cpu_count() or 1))
+
+
+def _iter_paths(patterns: Iterable[str]) -> Iterator[str]:
+    """Yield files matching each pattern, lazily.
+
+    The common case -- wildcards only in the file name -- is served by a
+    single ``os.scandir`` of the parent directory, whose ``is_file`` check
+    uses the cached directory entry type instead of a ``stat`` per match.
+    Patterns with wildcards in the directory part fall back to ``glob``.
+    Literal paths (what the shell passes after expanding ``*.pdf`` itself)
+    are checked with a single ``isfile`` rather than a directory scan each.
+    """
+    for pattern in patterns:
+        parent, name = os.path.split(pattern)
+        if glob.has_magic(parent):
+            yield from glob.iglob(pattern)
+            continue
+        if not glob.has_magic(name):
+            if os.path.isfile(pattern):
+                yield pattern
+            continue
+        try:
+            entries = os.scandir(parent or ".")
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with entries:
+            for entry in entries:
+                # Like glob, wildcards don't match dot-files unless the pattern does.
+                if entry.name.startswith(".") and not name.startswith("."):
+                    continue
+                if fnmatch.fnmatchcase(entry.name, name) and entry.is_file():
+                    yield os.path.join(parent, entry.name)
+
 
+def _report(results: Iterable[dict]) -> None:
+    for res in results:
+        print(f"Processed {res['file']}: matched={res['matched']}")
 
 
 def main() -> None:
@@ -178,17 +292,24 @@ def main() -> None:
     args = parser.parse_args()
     if not args.database_url:
         raise SystemExit("DATABASE_URL must be provided via --database-url or environment variable")
-    engine = create_engine(args.database_url)
+    engine, _, _ = _worker_context(args.database_url)
     Base.metadata.create_all(engine)
-    session = Session(engine)
-    provider = get_provider()
-    netsuite = NetSuiteClient()
-    files = []
-    for pattern in args.input:
-        files.extend([Path(p) for p in glob.glob(pattern)])
-    for path in files:
-        process_file(path, session, provider, netsuite, args.slack_webhook)
-    session.close()
+    # Materialised because the pool's chunksize depends on the file count.
+    files = list(_iter_paths(args.input))
+    workers = min(_worker_count(), len(files)) or 1
+    jobs = (files, repeat(args.database_url), repeat(args.slack_webhook))
+    if workers == 1:
+        # Not worth the fork/pickle overhead for a single worker.
+        _report(map(process_one, *jobs))
+        _slack_queue.shutdown(wait=True)
+        return
+    # Pooled connections must not be shared with forked workers.
+    engine.dispose()
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        _report(ex.map(process_one, *jobs, chunksize=chunksize))
+    # Workers flush their own queues on exit; wait for ours before returning.
+    _slack_queue.shutdown(wait=True)
 
 
 if __name__ == "__main__":
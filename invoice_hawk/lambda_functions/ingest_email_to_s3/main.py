@@ -5,16 +5,22 @@ attachments in S3.
 This function is designed to run on a schedule (e.g. via EventBridge) and
 connects to an IMAP server using credentials supplied via environment
 variables.  It iterates through unread emails, extracts PDF attachments, and
-uploads them to the configured S3 bucket.
+uploads them to the configured S3 bucket.  Uploads run concurrently on a
+thread pool since each one is an independent, latency-bound S3 request.
 """
 
 import email
 import imaplib
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
 from email.message import EmailMessage
 from typing import List, Tuple
 
-from invoice_hawk.utils import upload_file_to_s3
+from invoice_hawk.utils import get_s3_client, upload_file_to_s3
+
+
+# Kept at module scope so warm Lambda containers reuse the threads.
+_s3_pool = ThreadPoolExecutor(max_workers=16)
 
 
 def _connect_imap() -> imaplib.IMAP4_SSL:
@@ -34,13 +40,17 @@ def _fetch_unread_emails(mail: imaplib.IMAP4_SSL) -> List[Tuple[bytes, bytes]]:
     status, data = mail.search(None, "UNSEEN")
     if status != "OK":
         return []
-    messages = []
-    for num in data[0].split():
-        status, msg_data = mail.fetch(num, "(RFC822)")
-        if status == "OK":
-            messages.extend(msg_data)
-        # mark as seen
-        mail.store(num, "+FLAGS", "\\Seen")
+    ids = data[0].split()
+    if not ids:
+        return []
+    # One FETCH over the whole message set: a single round-trip instead of one per message.
+    status, msg_data = mail.fetch(b",".join(ids), "(RFC822)")
+    if status != "OK":
+        return []
+    # The response interleaves (envelope, body) tuples with b")" terminators.
+    messages = [part for part in msg_data if isinstance(part, tuple)]
+    # mark as seen, again as one command over the same message set
+    mail.store(b",".join(ids), "+FLAGS", "\\Seen")
     return messages
 
 
@@ -59,11 +69,18 @@ def handler(event, context):  # pragma: no cover - entry point called by AWS
     if not bucket:
         raise RuntimeError("Missing INVOICE_BUCKET environment variable")
     mail = _connect_imap()
+    s3 = get_s3_client()  # one client shared by all upload threads
     raw_messages = _fetch_unread_emails(mail)
+    uploads = {}
     for _, raw in raw_messages:
         msg = email.message_from_bytes(raw)
         attachments = _extract_pdf_attachments(msg)
         for filename, content in attachments:
             key = os.path.join("inbox", filename)
-            upload_file_to_s3(content, bucket, key)
+            uploads[_s3_pool.submit(upload_file_to_s3, content, bucket, key, client=s3)] = key
+    wait(uploads)
+    # Let every upload finish before failing so one bad attachment doesn't drop the rest.
+    failed = {key: fut.exception() for fut, key in uploads.items() if fut.exception() is not None}
+    if failed:
+        raise RuntimeError(f"Failed to upload {len(failed)} attachment(s) to S3: {failed}")
     return {"status": "success", "processed": len(raw_messages)}
\ No newline at end of file
@@ -10,16 +10,19 @@ accordingly.
 
 import os
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 
-from invoice_hawk.models import Base, Invoice, AuditLog
+from invoice_hawk.models import Base, Invoice, AuditLog, create_db_engine
 from invoice_hawk.netsuite_client import NetSuiteClient
 
+# Statuses from which an approve/reject decision may still be applied.
+PENDING_STATUSES = ("matched", "flagged", "awaiting_approval")
+
 
 def _get_db_session() -> Session:
     db_url = os.environ.get("DATABASE_URL")
-    engine = create_engine(db_url)
+    engine = create_db_engine(db_url)
     Base.metadata.create_all(engine)
     return Session(engine)
 
@@ -30,10 +33,22 @@ def handler(event, context):  # pragma: no cover - entry point called by AWS
     if not invoice_id or decision not in {"approve", "reject"}:
         raise ValueError("Both invoice_id and a valid decision are required")
     session = _get_db_session()
-    invoice = session.get(Invoice, invoice_id)
+    # Lock the row for the rest of the transaction.  A duplicate Slack click
+    # either finds it locked (SKIP LOCKED) or already decided, and returns
+    # without posting to NetSuite a second time.  Line items are loaded in
+    # the same round-trip instead of lazily per access.
+    invoice = session.execute(
+        select(Invoice)
+        .options(selectinload(Invoice.line_items))
+        .where(Invoice.id == invoice_id, Invoice.status.in_(PENDING_STATUSES))
+        .with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
     if not invoice:
+        exists = session.get(Invoice, invoice_id) is not None
         session.close()
-        raise ValueError(f"Invoice {invoice_id} not found")
+        if not exists:
+            raise ValueError(f"Invoice {invoice_id} not found")
+        return {"invoice_id": invoice_id, "status": "already_processed"}
     netsuite = NetSuiteClient()
     if decision == "approve":
         ns_response = netsuite.post_invoice(
@@ -12,26 +12,52 @@ import os
 from typing import Any, Dict
 
 import boto3
-from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
-from invoice_hawk.models import Base, Invoice, LineItem, AuditLog
+from invoice_hawk.models import Base, Invoice, AuditLog, bulk_insert_line_items, create_db_engine
 from invoice_hawk.ocr_provider import get_provider
 
 
+# Built on first use and kept for the life of the container, so warm
+# invocations reuse the OCR client, S3 client and connection pool.
+_PROVIDER = None
+_S3 = None
+_ENGINE = None
+
+
+def _get_provider():
+    global _PROVIDER
+    if _PROVIDER is None:
+        _PROVIDER = get_provider()
+    return _PROVIDER
+
+
 def _download_pdf(bucket: str, key: str) -> bytes:
-    s3 = boto3.client("s3")
-    obj = s3.get_object(Bucket=bucket, Key=key)
+    global _S3
+    if _S3 is None:
+        _S3 = boto3.client("s3")
+    obj = _S3.get_object(Bucket=bucket, Key=key)
     return obj["Body"].read()
 
 
+def _get_engine() -> Engine:
+    global _ENGINE
+    if _ENGINE is None:
+        db_url = os.environ.get("DATABASE_URL")
+        if not db_url:
+            raise RuntimeError("DATABASE_URL environment variable is not set")
+        kwargs: Dict[str, Any] = {"pool_pre_ping": True}
+        if not db_url.startswith("sqlite"):
+            # One concurrent request per container; a small overflow covers retries.
+            kwargs.update(pool_size=1, max_overflow=2)
+        _ENGINE = create_db_engine(db_url, **kwargs)
+        Base.metadata.create_all(_ENGINE)
+    return _ENGINE
+
+
 def _get_db_session() -> Session:
-    db_url = os.environ.get("DATABASE_URL")
-    if not db_url:
-        raise RuntimeError("DATABASE_URL environment variable is not set")
-    engine = create_engine(db_url)
-    Base.metadata.create_all(engine)
-    return Session(engine)
+    return Session(_get_engine())
 
 
 def _persist_invoice(session: Session, data: Dict[str, Any]) -> int:
@@ -42,14 +68,6 @@ def _persist_invoice(session: Session, data: Dict[str, Any]) -> int:
         total=data["total"],
         purchase_order_number=data["purchase_order_number"],
     )
-    for li in data.get("line_items", []):
-        invoice.line_items.append(
-            LineItem(
-                description=li.get("description"),
-                quantity=li.get("quantity", 0),
-                price=li.get("price", 0),
-            )
-        )
     session.add(invoice)
     session.add(
         AuditLog(
@@ -58,6 +76,8 @@ def _persist_invoice(session: Session, data: Dict[str, Any]) -> int:
             details=data,
         )
     )
+    session.flush()  # assigns invoice.id for the line-item rows
+    bulk_insert_line_items(session, invoice.id, data.get("line_items", []))
     session.commit()
     invoice_id = invoice.id
     return invoice_id
@@ -68,7 +88,7 @@ def handler(event, context):  # pragma: no cover - entry point called by AWS
     bucket = record["s3"]["bucket"]["name"]
     key = record["s3"]["object"]["key"]
     content = _download_pdf(bucket, key)
-    provider = get_provider()
+    provider = _get_provider()
     extracted = provider.extract_fields(content)
     session = _get_db_session()
     invoice_id = _persist_invoice(session, extracted)
@@ -11,20 +11,31 @@ to the audit log.
 import os
 from typing import Dict, List
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 
-from invoice_hawk.models import Base, Invoice, LineItem, AuditLog
+from invoice_hawk._match_kernels import HAVE_NUMPY, VECTORIZE_MIN_LINES, line_arrays, lines_match
+from invoice_hawk.models import Base, Invoice, LineItem, AuditLog, create_db_engine
 from invoice_hawk.netsuite_client import NetSuiteClient
 
 
 PRICE_TOLERANCE = 0.02  # ±2 %
 QTY_TOLERANCE = 0.01    # ±1 %
 
+# Reused across warm invocations so its PO cache survives between events.
+_NETSUITE = None
+
+
+def _get_netsuite() -> NetSuiteClient:
+    global _NETSUITE
+    if _NETSUITE is None:
+        _NETSUITE = NetSuiteClient()
+    return _NETSUITE
+
 
 def _get_db_session() -> Session:
     db_url = os.environ.get("DATABASE_URL")
-    engine = create_engine(db_url)
+    engine = create_db_engine(db_url)
     Base.metadata.create_all(engine)
     return Session(engine)
 
@@ -33,11 +44,12 @@ def _compare_lines(
     invoice_lines: List[LineItem], po_lines: List[Dict[str, float]]
 ) -> bool:
     """Return True if all invoice lines are within tolerance of PO lines."""
-    for i, invoice_li in enumerate(invoice_lines):
-        # If the purchase order has fewer lines than the invoice, fail immediately
-        if i >= len(po_lines):
-            return False
-        po_li = po_lines[i]
+    # If the purchase order has fewer lines than the invoice, fail immediately
+    if len(invoice_lines) > len(po_lines):
+        return False
+    if HAVE_NUMPY and len(invoice_lines) >= VECTORIZE_MIN_LINES:
+        return lines_match(*line_arrays(invoice_lines, po_lines), QTY_TOLERANCE, PRICE_TOLERANCE)
+    for invoice_li, po_li in zip(invoice_lines, po_lines):
         po_qty = po_li.get("quantity", 0)
         po_price = po_li.get("price", 0)
         # Compute tolerance thresholds relative to the invoice values rather than the PO.
@@ -45,10 +57,12 @@ def _compare_lines(
         # tolerance on an invoice quantity of 5 allows a difference of 0.05, so a PO
         # quantity of 4.95 is considered within tolerance. Similarly, a ±2 % price
         # tolerance on an invoice price of 100 allows a ±2.0 difference.
-        qty_tol = QTY_TOLERANCE * invoice_li.quantity if invoice_li.quantity else 0
-        price_tol = PRICE_TOLERANCE * float(invoice_li.price) if invoice_li.price else 0
-        qty_ok = abs(invoice_li.quantity - po_qty) <= qty_tol
-        price_ok = abs(float(invoice_li.price) - po_price) <= price_tol
+        inv_qty = invoice_li.quantity
+        inv_price = float(invoice_li.price)
+        qty_tol = QTY_TOLERANCE * inv_qty if inv_qty else 0
+        price_tol = PRICE_TOLERANCE * inv_price if inv_price else 0
+        qty_ok = abs(inv_qty - po_qty) <= qty_tol
+        price_ok = abs(inv_price - po_price) <= price_tol
         if not (qty_ok and price_ok):
             return False
     return True
@@ -59,11 +73,14 @@ def handler(event, context):  # pragma: no cover - entry point called by AWS
     if not invoice_id:
         raise ValueError("invoice_id is required")
     session = _get_db_session()
-    invoice = session.get(Invoice, invoice_id)
+    # Load line items in the same round-trip instead of lazily per access.
+    invoice = session.execute(
+        select(Invoice).options(selectinload(Invoice.line_items)).where(Invoice.id == invoice_id)
+    ).scalar_one_or_none()
     if not invoice:
         session.close()
         raise ValueError(f"Invoice {invoice_id} not found")
-    netsuite = NetSuiteClient()
+    netsuite = _get_netsuite()
     po_data = netsuite.get_purchase_order(invoice.purchase_order_number)
     within_tolerance = _compare_lines(invoice.line_items, po_data.get("lines", []))
     invoice.status = "matched" if within_tolerance else "flagged"
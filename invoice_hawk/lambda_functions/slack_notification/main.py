@@ -10,20 +10,44 @@ workflow.
 
 import os
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 
-from invoice_hawk.models import Base, Invoice, LineItem, AuditLog
+from invoice_hawk.models import Base, Invoice, LineItem, AuditLog, create_db_engine
 from invoice_hawk.utils import send_slack_message
 
 
 def _get_db_session() -> Session:
     db_url = os.environ.get("DATABASE_URL")
-    engine = create_engine(db_url)
+    engine = create_db_engine(db_url)
     Base.metadata.create_all(engine)
     return Session(engine)
 
 
+# Static parts of the approval attachment, built once at import; only the
+# invoice-specific fields are filled in per message.
+_ATTACHMENT_TEMPLATE = {
+    "text": "Please review this invoice.",
+    "fallback": "You are unable to approve this invoice",
+    "color": "#3AA3E3",
+    "attachment_type": "default",
+}
+_APPROVE_BUTTON = {
+    "name": "approve",
+    "text": "Approve ✅",
+    "type": "button",
+    "style": "primary",
+    "action_id": "approve_invoice",
+}
+_REJECT_BUTTON = {
+    "name": "reject",
+    "text": "Reject ❌",
+    "type": "button",
+    "style": "danger",
+    "action_id": "reject_invoice",
+}
+
+
 def _build_slack_message(invoice: Invoice) -> dict:
     total = float(invoice.total)
     lines_str = "\n".join(
@@ -35,34 +59,14 @@ def _build_slack_message(invoice: Invoice) -> dict:
         f"PO: {invoice.purchase_order_number}\n\n"
         f"Line Items:\n{lines_str}"
     )
-    attachments = [
-        {
-            "text": "Please review this invoice.",
-            "fallback": "You are unable to approve this invoice",
-            "callback_id": f"invoice_{invoice.id}",
-            "color": "#3AA3E3",
-            "attachment_type": "default",
-            "actions": [
-                {
-                    "name": "approve",
-                    "text": "Approve ✅",
-                    "type": "button",
-                    "style": "primary",
-                    "value": str(invoice.id),
-                    "action_id": "approve_invoice",
-                },
-                {
-                    "name": "reject",
-                    "text": "Reject ❌",
-                    "type": "button",
-                    "style": "danger",
-                    "value": str(invoice.id),
-                    "action_id": "reject_invoice",
-                },
-            ],
-        }
-    ]
-    return {"text": text, "attachments": attachments}
+    value = str(invoice.id)
+    # Shallow copies are enough: the templates hold only immutable values.
+    attachment = {
+        **_ATTACHMENT_TEMPLATE,
+        "callback_id": f"invoice_{invoice.id}",
+        "actions": [{**_APPROVE_BUTTON, "value": value}, {**_REJECT_BUTTON, "value": value}],
+    }
+    return {"text": text, "attachments": [attachment]}
 
 
 def handler(event, context):  # pragma: no cover - entry point called by AWS
@@ -70,7 +74,10 @@ def handler(event, context):  # pragma: no cover - entry point called by AWS
     if not invoice_id:
         raise ValueError("invoice_id is required")
     session = _get_db_session()
-    invoice = session.get(Invoice, invoice_id)
+    # Load line items in the same round-trip instead of lazily per access.
+    invoice = session.execute(
+        select(Invoice).options(selectinload(Invoice.line_items)).where(Invoice.id == invoice_id)
+    ).scalar_one_or_none()
     if not invoice:
         session.close()
         raise ValueError(f"Invoice {invoice_id} not found")
@@ -7,6 +7,8 @@ schema can be initialised via SQLAlchemy’s metadata create functions.
 """
 
 import datetime as _dt
+from typing import Any, Iterable, List, Mapping
+
 from sqlalchemy import (
     Column,
     Integer,
@@ -15,36 +17,67 @@ from sqlalchemy import (
     DateTime,
     Numeric,
     ForeignKey,
+    Index,
     JSON,
     Float,
+    case,
+    insert,
+    create_engine,
+    update,
 )
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, relationship
 
+from .utils import json_dumps, json_loads
+
 Base = declarative_base()
 
+# Postgres stores audit details as parsed JSONB (no re-parse on read, and
+# GIN-indexable); other databases keep the generic JSON type.
+_JSON = JSON().with_variant(JSONB(), "postgresql")
+
+
+def create_db_engine(db_url: str, **kwargs: Any) -> Engine:
+    """Create an engine whose JSON columns are (de)serialised with orjson when available."""
+    kwargs.setdefault("json_serializer", lambda value: json_dumps(value).decode("utf-8"))
+    kwargs.setdefault("json_deserializer", json_loads)
+    return create_engine(db_url, **kwargs)
+
 
 class Invoice(Base):
     """Represents a vendor invoice extracted from a PDF."""
 
     __tablename__ = "invoices"
+    __table_args__ = (Index("ix_invoice_vendor_date", "vendor", "invoice_date"),)
 
     id = Column(Integer, primary_key=True)
     vendor = Column(String, nullable=False)
     invoice_number = Column(String, nullable=False, unique=True)
     invoice_date = Column(Date, nullable=False)
     total = Column(Numeric(10, 2), nullable=False)
-    purchase_order_number = Column(String, nullable=False)
+    purchase_order_number = Column(String, nullable=False, index=True)
     status = Column(
         String,
         nullable=False,
         default="pending",  # possible values: pending, matched, flagged, awaiting_approval, approved, rejected, error
+        index=True,
     )
     created_at = Column(DateTime, default=_dt.datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=_dt.datetime.utcnow, onupdate=_dt.datetime.utcnow)
 
     # relationships
-    line_items = relationship("LineItem", back_populates="invoice", cascade="all, delete-orphan")
-    audit_logs = relationship("AuditLog", back_populates="invoice", cascade="all, delete-orphan")
+    # Line items are read with almost every invoice: load them for a whole
+    # result set in one IN (...) query.  Audit logs are rarely needed, so lazy
+    # access raises; load them explicitly with selectinload() when required.
+    line_items = relationship("LineItem", back_populates="invoice", cascade="all, delete-orphan", lazy="selectin")
+    audit_logs = relationship(
+        "AuditLog",
+        back_populates="invoice",
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True,  # the FK's ON DELETE CASCADE removes them
+    )
 
     def __repr__(self) -> str:
         return f"<Invoice id={self.id} number={self.invoice_number} vendor={self.vendor}>"
@@ -74,14 +107,65 @@ class AuditLog(Base):
     """Audit log capturing events across the invoice lifecycle."""
 
     __tablename__ = "audit_log"
+    __table_args__ = (
+        # Containment searches over details (details @> '{...}'); Postgres only.
+        Index("ix_auditlog_details_gin", "details", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True)
     invoice_id = Column(Integer, ForeignKey("invoices.id", ondelete="CASCADE"), nullable=True)
     event_type = Column(String, nullable=False)
-    details = Column(JSON, nullable=True)
+    details = Column(_JSON, nullable=True)
     created_at = Column(DateTime, default=_dt.datetime.utcnow, nullable=False)
 
     invoice = relationship("Invoice", back_populates="audit_logs")
 
     def __repr__(self) -> str:
-        return f"<AuditLog id={self.id} invoice_id={self.invoice_id} event={self.event_type}>"
\ No newline at end of file
+        return f"<AuditLog id={self.id} invoice_id={self.invoice_id} event={self.event_type}>"
+
+
+def bulk_insert_line_items(session, invoice_id: int, rows: Iterable[Mapping[str, Any]]) -> List[int]:
+    """
+    Insert an invoice's line items in a single executemany.
+
+    ``rows`` are the line-item dicts produced by OCR (``description``,
+    ``quantity``, ``price``).  Going through Core ``insert`` lets SQLAlchemy
+    batch them with insertmanyvalues rather than flushing one ORM INSERT per
+    line.  The ``Invoice.line_items`` relationship is not populated; reload
+    the invoice to read them back.
+
+    Returns the new line-item ids in the order of ``rows``.  They come back
+    from the same statement via ``INSERT ... RETURNING`` (SQLAlchemy 2.x
+    batches RETURNING with insertmanyvalues on Postgres and SQLite), so no
+    follow-up SELECT is needed.
+    """
+    params = [
+        {
+            "invoice_id": invoice_id,
+            "description": li.get("description"),
+            "quantity": li.get("quantity", 0),
+            "price": li.get("price", 0),
+        }
+        for li in rows
+    ]
+    if not params:
+        return []
+    stmt = insert(LineItem).returning(LineItem.id, sort_by_parameter_order=True)
+    return list(session.scalars(stmt, params))
+
+
+def apply_status_changes(session, changes: Mapping[int, str]) -> int:
+    """
+    Set the status of several invoices in one UPDATE.
+
+    ``changes`` maps invoice id to its new status (e.g. from a multi-select
+    approval).  A ``CASE`` on the id picks each row's status, so N decisions
+    cost a single statement.  Returns the number of rows matched.
+    """
+    if not changes:
+        return 0
+    status = case({invoice_id: new for invoice_id, new in changes.items()}, value=Invoice.id)
+    result = session.execute(
+        update(Invoice).where(Invoice.id.in_(list(changes))).values(status=status)
+    )
+    return result.rowcount
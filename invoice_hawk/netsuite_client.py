@@ -10,13 +10,58 @@ and endpoints are available.
 
 # invoice_hawk/netsuite_client.py
 from __future__ import annotations
+import asyncio
+import importlib.util
 import os, time, requests
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .utils import json_dumps, maybe_gzip
+
+try:
+    # httpx is only needed for AsyncNetSuiteClient.
+    import httpx  # type: ignore
+except Exception:
+    httpx = None  # type: ignore
 
 class NetSuiteError(Exception):
     pass
 
-class NetSuiteClient:
+class _TTLCache:
+    """Small LRU mapping whose entries expire ``ttl`` seconds after being stored."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires, value = item
+        if expires <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+class _NetSuiteConfig:
+    """Settings shared by the sync and async clients."""
+
     def __init__(
         self,
         *,
@@ -25,6 +70,9 @@ class NetSuiteClient:
         timeout: float = 30.0,
         max_retries: Optional[int] = None,
         backoff_seconds: Optional[float] = None,
+        po_cache_ttl: float = 60.0,
+        po_cache_size: int = 1024,
+        gzip_requests: Optional[bool] = None,
     ) -> None:
         self.base_url = (base_url or os.getenv("NETSUITE_BASE_URL", "https://example.com")).rstrip("/")
         env_test = os.getenv("NETSUITE_TEST_MODE", "false").lower() in ("1", "true", "yes")
@@ -32,6 +80,36 @@ class NetSuiteClient:
         self.timeout = timeout
         self.max_retries = int(os.getenv("NETSUITE_MAX_RETRIES", str(max_retries if max_retries is not None else 3)))
         self.backoff_seconds = float(os.getenv("NETSUITE_RETRY_BACKOFF", str(backoff_seconds if backoff_seconds is not None else 0.0)))
+        # Off by default: only enable for endpoints that accept gzip request bodies.
+        env_gzip = os.getenv("NETSUITE_GZIP_REQUESTS", "false").lower() in ("1", "true", "yes")
+        self.gzip_requests = env_gzip if gzip_requests is None else gzip_requests
+        # PO number -> purchase order; POs are read-mostly while invoices are
+        # matched, but can change, so entries expire after a short TTL.
+        self._po_cache = _TTLCache(po_cache_size, po_cache_ttl)
+
+    def clear_cache(self) -> None:
+        """Forget all cached purchase orders."""
+        self._po_cache.clear()
+
+    def _encode_body(self, json: Optional[dict]) -> Tuple[Optional[bytes], Dict[str, str]]:
+        """Return the request body and headers for ``json``; (None, {}) means send it as-is."""
+        if json is None or not self.gzip_requests:
+            return None, {}
+        body, headers = maybe_gzip(json_dumps(json))
+        return body, {"Content-Type": "application/json", **headers}
+
+    def _test_po(self, po_number: str) -> Dict[str, Any]:
+        # Keys match the code that compares invoice vs PO lines
+        return {"po_number": po_number, "lines": [{"sku": "KB-101", "quantity": 10, "price": 99.5}]}
+
+class NetSuiteClient(_NetSuiteConfig):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        # Keep TCP/TLS connections alive across calls; retries are handled in _request.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
 
     def _request(self, method: str, path: str, json: Optional[dict] = None) -> Dict[str, Any]:
         if self.test_mode:
@@ -39,38 +117,39 @@ class NetSuiteClient:
             return {"status": "dry-run", "method": method, "path": path, "json": json or {}}
 
         url = f"{self.base_url}/{path.lstrip('/')}"
+        body, headers = self._encode_body(json)
+        send = {"json": json} if body is None else {"data": body, "headers": headers}
         last_exc: Optional[Exception] = None
         for attempt in range(self.max_retries + 1):
             try:
-                resp = requests.request(method.upper(), url, json=json, timeout=self.timeout)
-            except TypeError:
-
-                # Test double doesn't accept 'timeout'
-                resp = requests.request(method.upper(), url, json=json)
-
-                if resp.status_code == 429:
-                    if attempt == self.max_retries:
-                        raise NetSuiteError("Rate limited (429) after retries")
-                    time.sleep(self.backoff_seconds * (2 ** attempt))
-                    continue
-                if resp.status_code >= 400:
-                    raise NetSuiteError(f"HTTP {resp.status_code}: {resp.text}")
-                try:
-                    return resp.json()
-                except ValueError:
-                    return {"text": resp.text}
-            except Exception as exc:
+                resp = self._session.request(method.upper(), url, timeout=self.timeout, **send)
+            except requests.RequestException as exc:
                 last_exc = exc
                 if attempt == self.max_retries:
                     raise
                 time.sleep(self.backoff_seconds * (2 ** attempt))
+                continue
+            if resp.status_code == 429:
+                if attempt == self.max_retries:
+                    raise NetSuiteError("Rate limited (429) after retries")
+                time.sleep(self.backoff_seconds * (2 ** attempt))
+                continue
+            if resp.status_code >= 400:
+                raise NetSuiteError(f"HTTP {resp.status_code}: {resp.text}")
+            try:
+                return resp.json()
+            except ValueError:
+                return {"text": resp.text}
         raise NetSuiteError(str(last_exc) if last_exc else "Unknown NetSuite error")
 
     def get_purchase_order(self, po_number: str) -> Dict[str, Any]:
         if self.test_mode:
-            # Keys match the code that compares invoice vs PO lines
-            return {"po_number": po_number, "lines": [{"sku": "KB-101", "quantity": 10, "price": 99.5}]}
-        return self._request("GET", f"po/{po_number}")
+            return self._test_po(po_number)
+        # Invoices in a batch often share a PO; only the first one hits the API.
+        po = self._po_cache.get(po_number)
+        if po is None:
+            po = self._po_cache[po_number] = self._request("GET", f"po/{po_number}")
+        return po
 
     def post_invoice(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -81,5 +160,101 @@ class NetSuiteClient:
             return {"external_id": "NS-INV-42"}  # <- what the tests expect
         return self._request("POST", "invoice", json=payload)
 
-__all__ = ["NetSuiteClient", "NetSuiteError"]
+class AsyncNetSuiteClient(_NetSuiteConfig):
+    """
+    asyncio counterpart of :class:`NetSuiteClient` for fetching many POs at once.
+
+    Requests share one pooled ``httpx.AsyncClient`` (HTTP/2 when ``h2`` is
+    installed), so independent lookups overlap instead of running back to
+    back.  Use it as an async context manager, or call :meth:`aclose`.
+    ``transport`` is handed to httpx unchanged (e.g. ``httpx.MockTransport``
+    in tests).
+    """
+
+    def __init__(self, transport: Any = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        if httpx is None:
+            raise RuntimeError("httpx is required for AsyncNetSuiteClient")
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_keepalive_connections=20),
+            transport=transport,
+        )
+        self._inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+    async def __aenter__(self) -> "AsyncNetSuiteClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _request(self, method: str, path: str, json: Optional[dict] = None) -> Dict[str, Any]:
+        if self.test_mode:
+            return {"status": "dry-run", "method": method, "path": path, "json": json or {}}
+
+        # Same retry policy as NetSuiteClient._request.
+        body, headers = self._encode_body(json)
+        send = {"json": json} if body is None else {"content": body, "headers": headers}
+        last_exc: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                resp = await self._client.request(method.upper(), path.lstrip("/"), **send)
+            except httpx.HTTPError as exc:
+                last_exc = exc
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self.backoff_seconds * (2 ** attempt))
+                continue
+            if resp.status_code == 429:
+                if attempt == self.max_retries:
+                    raise NetSuiteError("Rate limited (429) after retries")
+                await asyncio.sleep(self.backoff_seconds * (2 ** attempt))
+                continue
+            if resp.status_code >= 400:
+                raise NetSuiteError(f"HTTP {resp.status_code}: {resp.text}")
+            try:
+                return resp.json()
+            except ValueError:
+                return {"text": resp.text}
+        raise NetSuiteError(str(last_exc) if last_exc else "Unknown NetSuite error")
+
+    async def get_purchase_order(self, po_number: str) -> Dict[str, Any]:
+        if self.test_mode:
+            return self._test_po(po_number)
+        po = self._po_cache.get(po_number)
+        if po is not None:
+            return po
+        # Concurrent misses for the same PO share a single request.
+        task = self._inflight.get(po_number)
+        if task is None:
+            task = asyncio.ensure_future(self._request("GET", f"po/{po_number}"))
+            self._inflight[po_number] = task
+            task.add_done_callback(lambda _: self._inflight.pop(po_number, None))
+        # shield: one caller being cancelled must not cancel the others' request.
+        po = await asyncio.shield(task)
+        self._po_cache[po_number] = po
+        return po
+
+    async def get_purchase_orders(self, po_numbers: List[str]) -> List[Dict[str, Any]]:
+        """Fetch several POs concurrently; results are in the order given."""
+        unique = list(dict.fromkeys(po_numbers))
+        # Let every request finish before surfacing the first failure.
+        results = await asyncio.gather(*(self.get_purchase_order(n) for n in unique), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        by_number = dict(zip(unique, results))
+        return [by_number[n] for n in po_numbers]
+
+    async def post_invoice(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.test_mode:
+            return {"external_id": "NS-INV-42"}
+        return await self._request("POST", "invoice", json=payload)
+
+__all__ = ["AsyncNetSuiteClient", "NetSuiteClient", "NetSuiteError"]
 
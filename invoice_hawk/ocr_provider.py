@@ -8,13 +8,11 @@ provider is selected via the `OCR_PROVIDER` environment variable.
 """
 
 # invoice_hawk/ocr_provider.py
-import os, json
-from typing import Dict, Any
+import os
+from functools import lru_cache
+from typing import Dict, Any, Optional
 
-
-# invoice_hawk/ocr_provider.py
-import os, json
-from typing import Dict, Any
+from .utils import json_loads
 
 def _gpt_stub_result() -> Dict[str, Any]:
     return {
@@ -30,6 +28,14 @@ def _gpt_stub_result() -> Dict[str, Any]:
     }
 
 class BaseOCRProvider:
+    """Interface for OCR providers.
+
+    ``extract_fields`` receives the PDF *content*, never a file path, so a
+    PDF is read at most once per invocation.  ``content`` may be ``bytes``
+    or any read-only bytes-like object (``memoryview``, ``mmap``); providers
+    must not retain it after returning.
+    """
+
     def extract_fields(self, content: bytes) -> Dict[str, Any]:
         raise NotImplementedError
 
@@ -60,7 +66,7 @@ class GPTVisionProvider(BaseOCRProvider):
             if not isinstance(raw, str):
                 # SDK present but wrong shape → use GPT stub
                 return _gpt_stub_result()
-            return json.loads(raw)  # pass through unchanged
+            return json_loads(raw)  # pass through unchanged
         except Exception:
             # Any API error → fallback parser
             return FallbackOCRProvider().extract_fields(content)
@@ -80,9 +86,13 @@ class FallbackOCRProvider(BaseOCRProvider):
 
 def get_provider() -> BaseOCRProvider:
     name = os.getenv("OCR_PROVIDER", "fallback").lower()
-    if name == "gpt":
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            return FallbackOCRProvider()
+    api_key = os.getenv("OPENAI_API_KEY") if name == "gpt" else None
+    return _build_provider(name, api_key)
+
+@lru_cache(maxsize=8)
+def _build_provider(name: str, api_key: Optional[str]) -> BaseOCRProvider:
+    # Keyed on the settings rather than cached outright, so a changed
+    # environment still selects a different provider.
+    if name == "gpt" and api_key:
         return GPTVisionProvider(api_key=api_key)
     return FallbackOCRProvider()
@@ -9,36 +9,150 @@ the action, and optionally posts a follow‑up message to Slack.
 
 To run locally, install ``fastapi`` and ``uvicorn`` (see requirements).
 Set ``SLACK_SIGNING_SECRET`` in your environment.  Optional variables
-include ``SLACK_BOT_TOKEN`` for updating messages via the Slack Web API.
+include ``SLACK_BOT_TOKEN`` for updating messages through the Slack Web
+API's ``chat.update`` method, called directly with ``httpx``.
 """
 
 from __future__ import annotations
 
+import asyncio
 import hmac
 import hashlib
-import json
+import importlib.util
 import os
 import time
-from typing import Any, Dict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
 
-from .models import Base, Invoice, AuditLog
-from .utils import send_slack_message
+from .models import Base, Invoice, AuditLog, create_db_engine
+from .utils import json_loads, send_slack_message
 
 try:
-    # The slack_sdk is optional; we use it only if a bot token is provided.
-    from slack_sdk import WebClient  # type: ignore
+    # httpx is optional; we use it only if a bot token is provided.
+    import httpx  # type: ignore
 except Exception:
-    WebClient = None  # type: ignore
+    httpx = None  # type: ignore
 
+SLACK_API_URL = "https://slack.com/api/"
 
-app = FastAPI()
+# Web API client shared by all requests while the app is running, so bursts
+# of chat.update calls reuse one connection (multiplexed over HTTP/2 when h2
+# is installed) instead of a TLS handshake each.
+_slack_http: Optional["httpx.AsyncClient"] = None
+
+
+# Audit rows are buffered and written in batches: one INSERT and one commit
+# per flush instead of one per Slack click.
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 0.05  # seconds to wait for more rows once one arrives
+
+_audit_queue: Optional[asyncio.Queue] = None
+
+
+@lru_cache(maxsize=None)
+def _get_engine(db_url: str) -> Engine:
+    """Return the process-wide pooled engine for ``db_url``, creating the schema once."""
+    kwargs: Dict[str, Any] = {"pool_pre_ping": True}
+    if not db_url.startswith("sqlite"):
+        kwargs.update(pool_size=10, max_overflow=20)
+    engine = create_db_engine(db_url, **kwargs)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@lru_cache(maxsize=None)
+def _get_sessionmaker(db_url: str) -> sessionmaker:
+    # Nothing is read back after commit, so skip expiring (and reloading) instances.
+    return sessionmaker(bind=_get_engine(db_url), expire_on_commit=False)
+
+
+def _write_audit_rows(session_factory: sessionmaker, rows: List[Dict[str, Any]]) -> None:
+    with session_factory() as session:
+        session.execute(insert(AuditLog), rows)
+        session.commit()
+
+
+def _write_audit_batch(session_factory: sessionmaker, rows: List[Dict[str, Any]]) -> None:
+    """Write ``rows``, retrying once, then row by row so one bad row cannot drop the batch."""
+    for _ in range(2):
+        try:
+            _write_audit_rows(session_factory, rows)
+            return
+        except Exception as exc:
+            print(f"[warn] Failed to write {len(rows)} audit rows: {exc}")
+    for row in rows:
+        try:
+            _write_audit_rows(session_factory, [row])
+        except Exception as exc:
+            print(f"[warn] Dropping audit row for invoice {row.get('invoice_id')}: {exc}")
+
+
+async def _drain_audit_queue(queue: asyncio.Queue, session_factory: sessionmaker) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + AUDIT_FLUSH_INTERVAL
+        while len(batch) < AUDIT_BATCH_SIZE:
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), deadline - loop.time()))
+            except asyncio.TimeoutError:
+                break
+        try:
+            await asyncio.to_thread(_write_audit_batch, session_factory, batch)
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+@asynccontextmanager
+async def _audit_writer():
+    global _audit_queue
+    db_url = os.getenv("DATABASE_URL")
+    if not db_url:
+        # Nothing to write to; the handler reports the missing URL per request.
+        yield
+        return
+    # Build the pool and create the schema at startup rather than on the first click.
+    session_factory = _get_sessionmaker(db_url)
+    queue: asyncio.Queue = asyncio.Queue()
+    writer = asyncio.create_task(_drain_audit_queue(queue, session_factory))
+    _audit_queue = queue
+    try:
+        yield
+    finally:
+        # Stop accepting rows, flush what is buffered, then stop the writer.
+        _audit_queue = None
+        await queue.join()
+        writer.cancel()
+        _get_engine(db_url).dispose()
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    global _slack_http
+    if httpx is not None:
+        _slack_http = _new_slack_http()
+    try:
+        async with _audit_writer():
+            yield
+    finally:
+        if _slack_http is not None:
+            client, _slack_http = _slack_http, None
+            await client.aclose()
+
+
+app = FastAPI(lifespan=_lifespan)
 
 # Allow CORS during development; in production restrict origins appropriately
 app.add_middleware(
@@ -50,6 +164,61 @@ app.add_middleware(
 )
 
 
+@lru_cache(maxsize=4)
+def _hmac_template(signing_secret: str) -> "hmac.HMAC":
+    # The keyed state depends only on the secret: derive it once, copy per request.
+    return hmac.new(signing_secret.encode(), digestmod=hashlib.sha256)
+
+
+def _apply_action(db_url: str, invoice_id: int, new_status: str, audit_row: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Set the invoice status (and write ``audit_row`` if given); return its number, or None if missing."""
+    with _get_sessionmaker(db_url)() as session:
+        # A single UPDATE ... RETURNING rather than loading the row first.
+        invoice_number = session.execute(
+            update(Invoice)
+            .where(Invoice.id == invoice_id)
+            .values(status=new_status)
+            .returning(Invoice.invoice_number)
+        ).scalar_one_or_none()
+        if invoice_number is None:
+            return None
+        if audit_row is not None:
+            session.execute(insert(AuditLog), [audit_row])
+        session.commit()
+        return invoice_number
+
+
+def _new_slack_http() -> "httpx.AsyncClient":
+    return httpx.AsyncClient(
+        base_url=SLACK_API_URL,
+        http2=importlib.util.find_spec("h2") is not None,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=5),
+    )
+
+
+async def _update_slack_messages(bot_token: str, updates: List[Dict[str, Any]]) -> List[Any]:
+    """
+    Send one ``chat.update`` per entry of ``updates`` concurrently.
+
+    Each entry is a ``chat.update`` body (``channel``, ``ts``, ``text``).
+    Returns the responses, or the exception raised for that entry.
+    """
+    headers = {"Authorization": f"Bearer {bot_token}"}
+
+    async def send(client: "httpx.AsyncClient") -> List[Any]:
+        return await asyncio.gather(
+            *(client.post("chat.update", json=update, headers=headers) for update in updates),
+            return_exceptions=True,
+        )
+
+    if _slack_http is not None:
+        return await send(_slack_http)
+    # Outside the app lifespan there is no shared client; use a short-lived one.
+    async with _new_slack_http() as client:
+        return await send(client)
+
+
 def _verify_slack_request(request: Request, body: bytes, signing_secret: str) -> bool:
     """Verify Slack signature according to Slack's signing docs.
 
@@ -64,12 +233,21 @@ def _verify_slack_request(request: Request, body: bytes, signing_secret: str) ->
     # Reject requests older than 5 minutes
     if abs(time.time() - float(timestamp)) > 60 * 5:
         return False
-    basestring = f"v0:{timestamp}:{body.decode()}"
-    computed = hmac.new(
-        signing_secret.encode(), basestring.encode(), hashlib.sha256
-    ).hexdigest()
-    expected_sig = f"v0={computed}"
-    return hmac.compare_digest(expected_sig, signature)
+    # Feed the signed "v0:<timestamp>:<body>" string in pieces; decoding the
+    # body to str and re-encoding it would copy it twice.
+    mac = _hmac_template(signing_secret).copy()
+    mac.update(b"v0:")
+    mac.update(timestamp.encode())
+    mac.update(b":")
+    mac.update(body)
+    # Compare raw digests rather than formatting our own hex signature.
+    if not signature.startswith("v0="):
+        return False
+    try:
+        received = bytes.fromhex(signature[3:])
+    except ValueError:
+        return False
+    return hmac.compare_digest(mac.digest(), received)
 
 
 @app.post("/slack/actions")
@@ -89,10 +267,15 @@ async def slack_actions(request: Request) -> JSONResponse:
     if not _verify_slack_request(request, body, signing_secret):
         raise HTTPException(status_code=401, detail="Invalid Slack signature")
     # Slack sends a form-urlencoded body; extract the 'payload' parameter
+    # straight from the bytes we already hold instead of re-parsing via form().
     try:
-        form = await request.form()
-        payload_json = form.get("payload") or body.decode()
-        payload: Dict[str, Any] = json.loads(payload_json)
+        # Parse as text: given bytes, parse_qs re-encodes the unquoted values
+        # as ASCII and fails on the non-ASCII text Slack echoes back (button
+        # labels, user names).  A form body is ASCII, so decoding is lossless;
+        # UTF-8 also covers a bare JSON body.
+        text = body.decode("utf-8")
+        payload_json = parse_qs(text, keep_blank_values=True).get("payload", [text])[0] or text
+        payload: Dict[str, Any] = json_loads(payload_json)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid payload")
     # Extract the action details
@@ -114,38 +297,42 @@ async def slack_actions(request: Request) -> JSONResponse:
     db_url = os.getenv("DATABASE_URL")
     if not db_url:
         raise HTTPException(status_code=500, detail="DATABASE_URL not configured")
-    engine = create_engine(db_url)
-    Base.metadata.create_all(engine)
-    session: Session = Session(engine)
-    try:
-        invoice = session.get(Invoice, invoice_id)
-        if not invoice:
-            return JSONResponse({"error": "Invoice not found"}, status_code=404)
-        invoice.status = new_status
-        # Store the message timestamp and channel if provided
-        message_ts = payload.get("message", {}).get("ts")
-        channel = payload.get("channel", {}).get("id")
-        session.add(
-            AuditLog(
-                invoice=invoice,
-                event_type="slack_action",
-                details={
-                    "action": action_id,
-                    "message_ts": message_ts,
-                    "channel": channel,
-                },
-            )
-        )
-        session.commit()
-    finally:
-        session.close()
+    # Store the message timestamp and channel if provided
+    message_ts = payload.get("message", {}).get("ts")
+    channel = payload.get("channel", {}).get("id")
+    audit_row = {
+        "invoice_id": invoice_id,
+        "event_type": "slack_action",
+        "details": {
+            "action": action_id,
+            "message_ts": message_ts,
+            "channel": channel,
+        },
+    }
+    # The session is synchronous; run it on the threadpool so the event loop
+    # keeps serving other Slack requests while this one waits on the database.
+    # Without the background writer (app used without its lifespan), the
+    # audit row is written inline in the same transaction.  Read the queue
+    # once: shutdown can clear it while the update runs on the threadpool.
+    queue = _audit_queue
+    invoice_number = await run_in_threadpool(
+        _apply_action, db_url, invoice_id, new_status, audit_row if queue is None else None
+    )
+    if invoice_number is None:
+        return JSONResponse({"error": "Invoice not found"}, status_code=404)
+    if queue is not None:
+        if _audit_queue is queue:
+            # No await before the put, so shutdown's join() will wait for this row.
+            queue.put_nowait(audit_row)
+        else:
+            # The writer is shutting down; write the row ourselves.
+            await run_in_threadpool(_write_audit_batch, _get_sessionmaker(db_url), [audit_row])
     # If we have a bot token and message_ts, update the original message via Slack API
     bot_token = os.getenv("SLACK_BOT_TOKEN")
-    if bot_token and message_ts and channel and WebClient:
+    if bot_token and message_ts and channel and httpx is not None:
         try:
-            client = WebClient(token=bot_token)
-            text = f"Invoice {invoice.invoice_number} was {new_status}."
-            client.chat_update(channel=channel, ts=message_ts, text=text)
+            text = f"Invoice {invoice_number} was {new_status}."
+            await _update_slack_messages(bot_token, [{"channel": channel, "ts": message_ts, "text": text}])
         except Exception:
             # Ignore Slack API errors silently
             pass
@@ -153,5 +340,5 @@ async def slack_actions(request: Request) -> JSONResponse:
         # Fall back to sending a new message if we cannot update
         webhook = os.getenv("SLACK_WEBHOOK_URL")
         if webhook:
-            send_slack_message(webhook, f"Invoice {invoice_id} {new_status}.")
+            await run_in_threadpool(send_slack_message, webhook, f"Invoice {invoice_id} {new_status}.")
     return JSONResponse({"ok": True})
\ No newline at end of file
@@ -8,42 +8,180 @@ third‑party libraries so that Lambda handlers remain focused on business logic
 
 from __future__ import annotations
 
+import gzip
+import io
+import json
 import os
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
 
-import boto3
-import requests
-from botocore.client import BaseClient
+try:
+    # orjson is optional; it encodes straight to UTF-8 bytes and is several
+    # times faster than the stdlib for the dicts we archive and post.
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # type: ignore
 
+if TYPE_CHECKING:
+    from botocore.client import BaseClient
+    from boto3.s3.transfer import TransferConfig
+    import requests
+
+# boto3 and requests are imported inside the helpers that use them: every
+# Lambda imports this module, and most handlers need only one (or neither),
+# so importing both up front would add to every cold start.
+
+# Bytes uploads above this size use a parallel multipart transfer.
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+
+
+@lru_cache(maxsize=1)
+def _transfer_config() -> "TransferConfig":
+    # File uploads are streamed from disk in 8 MiB parts rather than read into
+    # memory, which keeps peak RSS flat for large PDFs on small Lambdas.  Bytes
+    # above the same threshold are uploaded in parallel parts too.
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=8 * 1024 * 1024,
+        max_concurrency=4,
+        use_threads=True,
+    )
+
+
+@lru_cache(maxsize=1)
+def _slack_session() -> "requests.Session":
+    # Shared keep-alive session for Slack webhooks so consecutive notifications
+    # reuse one TLS connection.  POST must be listed explicitly for urllib3 to
+    # retry it on rate limits and transient 5xx responses.
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset({"POST"}),
+            ),
+        ),
+    )
+    return session
+
+
+# Payloads are pre-encoded with json_dumps, so the content type is set by hand.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def get_s3_client(region: Optional[str] = None) -> BaseClient:
+    """Return an S3 client configured using environment variables or IAM roles.
+
+    Clients are cached per region and credentials, so repeated calls do not
+    pay boto3's endpoint and credential-chain setup again.
+    """
+    return _s3_client(
+        region or os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
+        os.getenv("AWS_ACCESS_KEY_ID"),
+        os.getenv("AWS_SECRET_ACCESS_KEY"),
+    )
+
+
+@lru_cache(maxsize=8)
+def _s3_client(region: str, access_key: Optional[str], secret_key: Optional[str]) -> BaseClient:
+    import boto3
 
-def get_s3_client() -> BaseClient:
-    """Return an S3 client configured using environment variables or IAM roles."""
     return boto3.client(
         "s3",
-        aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-        aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-        region_name=os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        region_name=region,
     )
 
 
 def upload_file_to_s3(
-    content: bytes, bucket: str, key: str, *, content_type: str = "application/pdf"
+    content: Union[bytes, str, os.PathLike],
+    bucket: str,
+    key: str,
+    *,
+    content_type: str = "application/pdf",
+    client: Optional[BaseClient] = None,
 ) -> None:
-    """Upload binary content to an S3 bucket.
+    """Upload binary content or a local file to an S3 bucket.
 
     Parameters
     ----------
-    content : bytes
-        The raw file bytes.
+    content : bytes or path-like
+        The raw file bytes, or the path of a file to stream from disk using
+        a multipart transfer.  Bytes larger than the multipart threshold are
+        uploaded in parallel parts as well.
     bucket : str
         The S3 bucket name.
     key : str
         The object key (path within the bucket).
     content_type : str, optional
         MIME type of the object.  Defaults to application/pdf.
+    client : BaseClient, optional
+        S3 client to use.  Pass a shared client when uploading from several
+        threads; creating clients concurrently is not thread-safe.
+    """
+    s3 = client or get_s3_client()
+    if isinstance(content, (str, os.PathLike)):
+        s3.upload_file(
+            os.fspath(content),
+            bucket,
+            key,
+            ExtraArgs={"ContentType": content_type},
+            Config=_transfer_config(),
+        )
+        return
+    if len(content) <= MULTIPART_THRESHOLD:
+        s3.put_object(Bucket=bucket, Key=key, Body=content, ContentType=content_type)
+        return
+    # Large in-memory PDFs go through the transfer manager as well, so their
+    # parts upload in parallel instead of as one long single-stream PUT.
+    s3.upload_fileobj(
+        io.BytesIO(content),
+        bucket,
+        key,
+        ExtraArgs={"ContentType": content_type},
+        Config=_transfer_config(),
+    )
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialise ``obj`` to compact UTF-8 JSON bytes.
+
+    Values JSON has no type for (dates, decimals) are written as strings.
     """
-    s3 = get_s3_client()
-    s3.put_object(Bucket=bucket, Key=key, Body=content, ContentType=content_type)
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=str, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def maybe_gzip(body: bytes, min_size: int = 1024) -> "tuple[bytes, Dict[str, str]]":
+    """Gzip ``body`` if it is larger than ``min_size``.
+
+    Returns the (possibly compressed) body and the headers to send with it.
+    Level 1 is used: JSON compresses well even at the fastest setting.
+    Only use this for endpoints known to accept ``Content-Encoding: gzip``.
+    """
+    if len(body) <= min_size:
+        return body, {}
+    return gzip.compress(body, compresslevel=1), {"Content-Encoding": "gzip"}
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def send_slack_message(webhook_url: str, text: str, attachments: Optional[list] = None) -> None:
@@ -55,7 +193,9 @@ def send_slack_message(webhook_url: str, text: str, attachments: Optional[list]
     payload: Dict[str, Any] = {"text": text}
     if attachments:
         payload["attachments"] = attachments
-    response = requests.post(webhook_url, json=payload, timeout=10)
+    response = _slack_session().post(
+        webhook_url, data=json_dumps(payload), headers=_JSON_HEADERS, timeout=10
+    )
     response.raise_for_status()
 
 
@@ -7,14 +7,160 @@ adjusting ``sys.path``, running ``pytest`` from the project root may
 result in ``ModuleNotFoundError`` for the ``app`` package because the
 current working directory might not be included in Python's import search
 path when using certain pytest import modes.
+
+It also provides fixtures shared by several test modules.
 """
 
+import json
 import os
 import sys
+from contextlib import ExitStack
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
 
 # Compute the repository root relative to this file (tests directory is one level deep)
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 
 # Prepend the root directory to sys.path if it's not already present
 if ROOT_DIR not in sys.path:
-    sys.path.insert(0, ROOT_DIR)
\ No newline at end of file
+    sys.path.insert(0, ROOT_DIR)
+
+
+@pytest.fixture
+def env(monkeypatch):
+    """Set several environment variables in one call; ``None`` unsets one.
+
+    Changes are undone by ``monkeypatch`` at teardown.
+    """
+
+    def _set(**kv):
+        for key, value in kv.items():
+            if value is None:
+                monkeypatch.delenv(key, raising=False)
+            else:
+                monkeypatch.setenv(key, value)
+
+    return _set
+
+
+@pytest.fixture
+def patches():
+    """Patch several dotted targets in one call; all are undone together.
+
+    ``patches(**{"invoice_hawk.cli.upload_file_to_s3": spy})``
+    """
+    with ExitStack() as stack:
+
+        def _apply(**targets):
+            for target, value in targets.items():
+                stack.enter_context(patch(target, value))
+
+        yield _apply
+
+@pytest.fixture
+def openai_mock(monkeypatch):
+    """Serve ``POST /v1/chat/completions`` from an in-process httpx transport.
+
+    Mocking at the HTTP layer keeps tests independent of the SDK's resource
+    classes.  Call the returned function with the JSON payload the model
+    should answer with (a dict, or an already-encoded string), or with
+    ``error=`` an exception to raise instead.
+    """
+    httpx = pytest.importorskip("httpx")
+    openai = pytest.importorskip("openai")
+    answer = {}
+
+    def handler(request):
+        if request.method != "POST" or request.url.path != "/v1/chat/completions":
+            return httpx.Response(404)
+        if "error" in answer:
+            raise answer["error"]
+        return httpx.Response(200, content=answer["body"], headers={"Content-Type": "application/json"})
+
+    # The provider calls ``openai.chat.completions.create``; point ``openai.chat``
+    # at a client built on the mock transport (no retries, so errors surface at once).
+    client = openai.OpenAI(
+        api_key="test-key",
+        base_url="https://api.openai.com/v1/",
+        max_retries=0,
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    monkeypatch.setattr(openai, "chat", client.chat)
+
+    def _set(payload=None, *, error=None):
+        # Encode the response once here rather than on every request.
+        answer.clear()
+        if error is not None:
+            answer["error"] = error
+            return
+        content = payload if isinstance(payload, str) else json.dumps(payload)
+        answer["body"] = json.dumps(
+            {
+                "id": "test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": content},
+                    }
+                ],
+            }
+        ).encode()
+
+    yield _set
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def _engine(tmp_path_factory):
+    """One SQLite engine per test process, with the schema created once.
+
+    The database is a file so every connection in the process sees the same
+    data.  It lives on ``/dev/shm`` (RAM-backed) where available, and is
+    named after the xdist worker so parallel workers never share it.
+    """
+    from invoice_hawk.models import Base
+
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "master")
+    name = f"ih_test_{worker}_{os.getpid()}.db"
+    shm = "/dev/shm"
+    path = os.path.join(shm, name) if os.path.isdir(shm) else str(tmp_path_factory.getbasetemp() / name)
+    if os.path.exists(path):
+        os.unlink(path)
+    engine = create_engine(f"sqlite:///{path}")
+
+    # pysqlite defers BEGIN until the first DML statement, which would let a
+    # SAVEPOINT release commit for real; take over transaction control so
+    # the per-test rollback in ``db_session`` discards everything.
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+    os.unlink(path)
+
+
+@pytest.fixture
+def db_session(_engine):
+    """A ``Session`` whose work, commits included, is rolled back after the test."""
+    conn = _engine.connect()
+    trans = conn.begin()
+    session = Session(bind=conn, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        trans.rollback()
+        conn.close()
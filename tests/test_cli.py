@@ -0,0 +1,35 @@
+"""
+Tests for input path expansion in the CLI.
+
+``--input`` accepts glob patterns, but the shell usually expands
+``*.pdf`` first and hands over literal paths; both forms must resolve to
+the same files.
+"""
+
+import os
+
+from invoice_hawk.cli import _iter_paths
+
+
+def _make_files(tmp_path):
+    for name in ("a.pdf", "b.pdf", "notes.txt", ".hidden.pdf"):
+        (tmp_path / name).write_bytes(b"x")
+    (tmp_path / "sub.pdf").mkdir()
+
+
+def test_literal_paths_are_yielded_without_scanning(tmp_path, monkeypatch):
+    _make_files(tmp_path)
+    literal = [str(tmp_path / name) for name in ("a.pdf", "b.pdf", "missing.pdf", "sub.pdf")]
+
+    def no_scandir(*args, **kwargs):
+        raise AssertionError("literal paths must not scan the directory")
+
+    monkeypatch.setattr(os, "scandir", no_scandir)
+    # Missing files and directories are skipped, like the wildcard form does.
+    assert list(_iter_paths(literal)) == literal[:2]
+
+
+def test_wildcard_pattern_matches_files_only(tmp_path):
+    _make_files(tmp_path)
+    found = sorted(_iter_paths([str(tmp_path / "*.pdf")]))
+    assert found == [str(tmp_path / "a.pdf"), str(tmp_path / "b.pdf")]
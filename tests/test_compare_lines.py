@@ -0,0 +1,82 @@
+"""
+Tests for the CLI two-way match.
+
+``compare_lines`` switches to a NumPy (and, if installed, Numba) kernel for
+invoices with many lines.  These tests check that every path agrees with
+the scalar loop, including on the tolerance boundaries.
+"""
+
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from invoice_hawk import _match_kernels, cli
+from invoice_hawk.cli import compare_lines
+
+
+@dataclass(frozen=True, slots=True)
+class DummyLineItem:
+    quantity: float
+    price: float
+
+
+def _batch(n, po_qty_delta=0.0, po_price_delta=0.0):
+    invoice_lines = [DummyLineItem(100, 100.0) for _ in range(n)]
+    po_lines = [{"quantity": 100 + po_qty_delta, "price": 100.0 + po_price_delta} for _ in range(n)]
+    return invoice_lines, po_lines
+
+
+@pytest.mark.parametrize(
+    "qty_delta,price_delta,expected",
+    [
+        (0.0, 0.0, True),
+        (1.0, 2.0, True),  # exactly on the ±1 % / ±2 % boundary
+        (1.5, 0.0, False),
+        (0.0, -2.5, False),
+    ],
+)
+def test_vectorized_matches_scalar(monkeypatch, qty_delta, price_delta, expected):
+    pytest.importorskip("numpy")
+    invoice_lines, po_lines = _batch(500, qty_delta, price_delta)
+    assert compare_lines(invoice_lines, po_lines) is expected
+    monkeypatch.setattr(_match_kernels, "HAVE_NUMBA", False)
+    assert compare_lines(invoice_lines, po_lines) is expected
+    monkeypatch.setattr(cli, "HAVE_NUMPY", False)
+    assert compare_lines(invoice_lines, po_lines) is expected
+
+
+def test_kernel_python_fallback():
+    np = pytest.importorskip("numpy")
+    inv = np.array([100.0, 0.0])
+    po_ok = np.array([101.0, 0.0])
+    po_bad = np.array([101.5, 0.0])
+    kernel = _match_kernels._lines_within_tol
+    assert kernel(inv, inv, po_ok, inv, 0.01, 0.02) is True
+    assert kernel(inv, inv, po_bad, inv, 0.01, 0.02) is False
+
+
+def test_more_invoice_lines_than_po_lines_fails():
+    invoice_lines, po_lines = _batch(50)
+    assert compare_lines(invoice_lines, po_lines[:-1]) is False
+
+
+def test_numba_is_not_imported_until_a_large_match():
+    """Importing the matchers must not pay Numba's import cost up front."""
+    code = (
+        "import sys\n"
+        "import invoice_hawk.cli, invoice_hawk.lambda_functions.po_lookup.main\n"
+        "assert 'numba' not in sys.modules"
+    )
+    repo_root = Path(cli.__file__).resolve().parents[1]
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=repo_root)
+
+
+def test_numba_cache_follows_writable_location(monkeypatch):
+    monkeypatch.setenv("NUMBA_CACHE_DIR", "/tmp/numba-cache")
+    assert _match_kernels._numba_cache_writable() is True
+    monkeypatch.delenv("NUMBA_CACHE_DIR")
+    monkeypatch.setattr(_match_kernels.os, "access", lambda path, mode: False)
+    assert _match_kernels._numba_cache_writable() is False
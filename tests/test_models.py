@@ -1,9 +1,19 @@
 import datetime as dt
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, selectinload
 
-from invoice_hawk.models import Base, Invoice, LineItem, AuditLog
+from invoice_hawk.models import (
+    AuditLog,
+    Base,
+    Invoice,
+    LineItem,
+    apply_status_changes,
+    bulk_insert_line_items,
+    create_db_engine,
+)
 
 
 def test_invoice_lineitem_relationship(tmp_path):
@@ -24,10 +34,104 @@ def test_invoice_lineitem_relationship(tmp_path):
     session.add(invoice)
     session.commit()
     # fetch and verify
-    fetched = session.query(Invoice).filter_by(invoice_number="TEST-001").first()
+    fetched = (
+        session.query(Invoice)
+        .options(selectinload(Invoice.audit_logs))
+        .filter_by(invoice_number="TEST-001")
+        .first()
+    )
     assert fetched is not None
     assert len(fetched.line_items) == 1
     assert fetched.line_items[0].quantity == 2
     # audit log not automatically created
     assert fetched.audit_logs == []
-    session.close()
\ No newline at end of file
+    session.close()
+
+
+def test_bulk_insert_line_items(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        invoice = Invoice(
+            vendor="Test Vendor",
+            invoice_number="TEST-002",
+            invoice_date=dt.date(2025, 7, 24),
+            total=300.00,
+            purchase_order_number="PO-TEST",
+        )
+        session.add(invoice)
+        session.flush()
+        rows = [{"description": f"Item {i}", "quantity": i + 1, "price": 10.0} for i in range(3)]
+        ids = bulk_insert_line_items(session, invoice.id, rows)
+        session.commit()
+
+        fetched = session.query(Invoice).filter_by(invoice_number="TEST-002").one()
+        assert [li.quantity for li in fetched.line_items] == [1, 2, 3]
+        assert ids == [li.id for li in fetched.line_items]
+        assert all(li.created_at is not None for li in fetched.line_items)
+
+
+def test_invoice_query_loads_line_items_in_two_statements(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(5):
+            invoice = Invoice(
+                vendor="Test Vendor",
+                invoice_number=f"TEST-{i:03d}",
+                invoice_date=dt.date(2025, 7, 24),
+                total=100.00,
+                purchase_order_number="PO-TEST",
+            )
+            invoice.line_items.append(LineItem(description="Item", quantity=1, price=100.0))
+            session.add(invoice)
+        session.commit()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with Session(engine) as session:
+        invoices = session.query(Invoice).all()
+        assert all(len(inv.line_items) == 1 for inv in invoices)
+        # one SELECT for the invoices, one IN (...) SELECT for all their line items
+        assert len(statements) == 2
+        with pytest.raises(InvalidRequestError):
+            invoices[0].audit_logs
+
+
+def test_apply_status_changes_is_one_statement(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(1, 4):
+            session.add(
+                Invoice(
+                    id=i,
+                    vendor="Test Vendor",
+                    invoice_number=f"TEST-{i:03d}",
+                    invoice_date=dt.date(2025, 7, 24),
+                    total=100.00,
+                    purchase_order_number="PO-TEST",
+                    status="awaiting_approval",
+                )
+            )
+        session.commit()
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        assert apply_status_changes(session, {1: "approved", 3: "rejected"}) == 2
+        session.commit()
+        assert len(statements) == 1
+
+        statuses = dict(session.query(Invoice.id, Invoice.status).all())
+        assert statuses == {1: "approved", 2: "awaiting_approval", 3: "rejected"}
+
+
+def test_audit_details_round_trip_through_engine_serializer(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(AuditLog(event_type="extracted", details={"invoice_date": dt.date(2025, 7, 24), "total": 1.5}))
+        session.commit()
+        log = session.query(AuditLog).one()
+        # Dates have no JSON type; the serializer writes them as ISO strings.
+        assert log.details == {"invoice_date": "2025-07-24", "total": 1.5}
@@ -3,8 +3,8 @@ Tests for the NetSuite client retry logic.
 
 These tests ensure that the internal `_request` method retries on HTTP
 429 responses and succeeds once a non‑429 response is returned.  We use
-monkeypatching to simulate different response sequences from
-``requests.request`` without making real network calls.
+monkeypatching to simulate different response sequences from the
+client's pooled ``requests.Session`` without making real network calls.
 """
 
 import os
@@ -33,18 +33,17 @@ def test_retry_on_429(monkeypatch):
     # Sequence: first call returns 429, second returns 200
     calls = {"count": 0}
     
-    def fake_request(method, url, headers=None, json=None):  # type: ignore[override]
+    def fake_request(method, url, **kwargs):  # type: ignore[override]
         calls["count"] += 1
         if calls["count"] == 1:
             return DummyResponse(429, headers={"Retry-After": "0"})
         return DummyResponse(200, json_data={"success": True})
 
-    import requests
-    monkeypatch.setattr(requests, "request", fake_request)
     os.environ["NETSUITE_BASE_URL"] = "https://example.com"
     os.environ["NETSUITE_MAX_RETRIES"] = "2"
     os.environ["NETSUITE_RETRY_BACKOFF"] = "0"
     ns = NetSuiteClient()
+    monkeypatch.setattr(ns._session, "request", fake_request)
     result = ns._request("GET", "/foo")
     assert result == {"success": True}
     assert calls["count"] == 2
@@ -52,12 +51,123 @@ def test_retry_on_429(monkeypatch):
 
 def test_request_raises_on_error(monkeypatch):
     """_request should raise NetSuiteError on non‑429 error responses."""
-    def fake_request(method, url, headers=None, json=None):  # type: ignore[override]
+    def fake_request(method, url, **kwargs):  # type: ignore[override]
         return DummyResponse(500, json_data={"error": "server"})
 
-    import requests
-    monkeypatch.setattr(requests, "request", fake_request)
     os.environ["NETSUITE_BASE_URL"] = "https://example.com"
     ns = NetSuiteClient()
+    monkeypatch.setattr(ns._session, "request", fake_request)
     with pytest.raises(NetSuiteError):
-        ns._request("GET", "/foo")
\ No newline at end of file
+        ns._request("GET", "/foo")
+
+
+def test_purchase_order_lookup_is_cached(monkeypatch):
+    """Repeated lookups of the same PO number should hit the API once."""
+    calls = {"count": 0}
+
+    def fake_request(method, url, **kwargs):  # type: ignore[override]
+        calls["count"] += 1
+        return DummyResponse(200, json_data={"url": url})
+
+    ns = NetSuiteClient(base_url="https://example.com", test_mode=False)
+    monkeypatch.setattr(ns._session, "request", fake_request)
+    assert ns.get_purchase_order("PO-1") == ns.get_purchase_order("PO-1")
+    ns.get_purchase_order("PO-2")
+    assert calls["count"] == 2
+
+
+def test_async_get_purchase_orders_fetches_concurrently(env):
+    """Distinct POs are fetched once each and returned in request order."""
+    httpx = pytest.importorskip("httpx")
+    import asyncio
+
+    from invoice_hawk.netsuite_client import AsyncNetSuiteClient
+
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        if len(seen) == 1:
+            return httpx.Response(429)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    async def run():
+        async with AsyncNetSuiteClient(
+            base_url="https://example.com",
+            test_mode=False,
+            max_retries=2,
+            transport=httpx.MockTransport(handler),
+        ) as ns:
+            return await ns.get_purchase_orders(["PO-1", "PO-2", "PO-1"])
+
+    env(NETSUITE_RETRY_BACKOFF="0")
+    results = asyncio.run(run())
+    assert [r["path"] for r in results] == ["/po/PO-1", "/po/PO-2", "/po/PO-1"]
+    # one 429 retried, then one successful request per distinct PO
+    assert len(seen) == 3
+
+
+def test_purchase_order_cache_expires_and_clears(monkeypatch):
+    """Expired entries and clear_cache() both force a fresh lookup."""
+    calls = {"count": 0}
+
+    def fake_request(method, url, **kwargs):  # type: ignore[override]
+        calls["count"] += 1
+        return DummyResponse(200, json_data={"n": calls["count"]})
+
+    ns = NetSuiteClient(base_url="https://example.com", test_mode=False, po_cache_ttl=0)
+    monkeypatch.setattr(ns._session, "request", fake_request)
+    ns.get_purchase_order("PO-1")
+    ns.get_purchase_order("PO-1")
+    assert calls["count"] == 2
+
+    ns = NetSuiteClient(base_url="https://example.com", test_mode=False)
+    monkeypatch.setattr(ns._session, "request", fake_request)
+    ns.get_purchase_order("PO-1")
+    ns.clear_cache()
+    ns.get_purchase_order("PO-1")
+    assert calls["count"] == 4
+
+
+def test_async_concurrent_lookups_share_one_request():
+    """Simultaneous misses for the same PO are coalesced into one request."""
+    httpx = pytest.importorskip("httpx")
+    import asyncio
+
+    from invoice_hawk.netsuite_client import AsyncNetSuiteClient
+
+    seen = []
+
+    async def handler(request):
+        seen.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    async def run():
+        async with AsyncNetSuiteClient(
+            base_url="https://example.com", test_mode=False, transport=httpx.MockTransport(handler)
+        ) as ns:
+            return await asyncio.gather(*(ns.get_purchase_order("PO-1") for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(seen) == 1
+    assert all(r == {"path": "/po/PO-1"} for r in results)
+
+
+def test_post_invoice_gzips_large_bodies_when_enabled(monkeypatch):
+    """With gzip_requests on, bodies over 1 KB are sent gzip-encoded."""
+    import gzip
+    import json
+
+    sent = {}
+
+    def fake_request(method, url, **kwargs):  # type: ignore[override]
+        sent.update(kwargs)
+        return DummyResponse(200, json_data={"external_id": "NS-1"})
+
+    ns = NetSuiteClient(base_url="https://example.com", test_mode=False, gzip_requests=True)
+    monkeypatch.setattr(ns._session, "request", fake_request)
+    payload = {"line_items": [{"description": "Widget", "quantity": i, "price": 1.0} for i in range(100)]}
+    assert ns.post_invoice(payload) == {"external_id": "NS-1"}
+    assert sent["headers"] == {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    assert json.loads(gzip.decompress(sent["data"])) == payload
@@ -15,4 +15,14 @@ def test_gpt_provider_stub_returns_consistent_fields():
     result = provider.extract_fields(b"dummy")
     assert result["vendor"] == "Acme Corp"
     assert result["invoice_number"] == "INV-1001"
-    assert len(result["line_items"]) == 2
\ No newline at end of file
+    assert len(result["line_items"]) == 2
+
+def test_stub_results_are_plain_dicts_owned_by_the_caller():
+    first = FallbackOCRProvider().extract_fields(b"a")
+    assert type(first) is dict and type(first["line_items"]) is list
+    first["vendor"] = "Other"
+    first["line_items"].append({"description": "Extra", "quantity": 1, "price": 1.0})
+    second = FallbackOCRProvider().extract_fields(b"b")
+    assert second["vendor"] == "Fallback Vendor"
+    assert len(second["line_items"]) == 1
+    assert type(GPTVisionProvider(api_key="DUMMY").extract_fields(b"x")["line_items"]) is list
@@ -1,24 +1,48 @@
+from dataclasses import dataclass
+
+import pytest
+
+from invoice_hawk import _match_kernels
+from invoice_hawk.lambda_functions.po_lookup import main as po_lookup
 from invoice_hawk.lambda_functions.po_lookup.main import _compare_lines
 
 
+@dataclass(frozen=True, slots=True)
 class DummyLineItem:
-    def __init__(self, quantity, price):
-        self.quantity = quantity
-        self.price = price
-
-
-def test_compare_lines_within_tolerance():
-    invoice_lines = [DummyLineItem(10, 100.0), DummyLineItem(5, 50.0)]
-    po_lines = [
-        {"quantity": 10.1, "price": 101.9},  # within ±1 % qty and ±2 % price
-        {"quantity": 4.95, "price": 49.1},
-    ]
-    assert _compare_lines(invoice_lines, po_lines) is True
-
-
-def test_compare_lines_outside_tolerance():
-    invoice_lines = [DummyLineItem(10, 100.0)]
-    po_lines = [
-        {"quantity": 12, "price": 110.0},  # >1 % qty diff and >2 % price diff
-    ]
-    assert _compare_lines(invoice_lines, po_lines) is False
\ No newline at end of file
+    quantity: float
+    price: float
+
+
+@pytest.mark.parametrize(
+    "inv,po,expected",
+    [
+        # within ±1 % qty and ±2 % price
+        ([(10, 100.0), (5, 50.0)], [{"quantity": 10.1, "price": 101.9}, {"quantity": 4.95, "price": 49.1}], True),
+        # >1 % qty diff and >2 % price diff
+        ([(10, 100.0)], [{"quantity": 12, "price": 110.0}], False),
+        # exactly 1 % qty and exactly 2 % price are still accepted
+        ([(100, 50.0)], [{"quantity": 101, "price": 51.0}], True),
+        ([(100, 50.0)], [{"quantity": 99, "price": 49.0}], True),
+        # just past either boundary is rejected
+        ([(100, 50.0)], [{"quantity": 101.5, "price": 50.0}], False),
+        ([(100, 50.0)], [{"quantity": 100, "price": 51.5}], False),
+        # the PO has fewer lines than the invoice
+        ([(1, 1.0), (1, 1.0)], [{"quantity": 1, "price": 1.0}], False),
+    ],
+)
+def test_compare_lines(inv, po, expected):
+    invoice_lines = [DummyLineItem(q, p) for q, p in inv]
+    assert _compare_lines(invoice_lines, po) is expected
+
+
+@pytest.mark.parametrize("qty_delta,expected", [(0.5, True), (1.0, True), (1.5, False)])
+def test_compare_lines_large_batch(monkeypatch, qty_delta, expected):
+    """10k-line invoices take the NumPy path and agree with the scalar loop."""
+    pytest.importorskip("numpy")
+    invoice_lines = [DummyLineItem(100, 50.0) for _ in range(10_000)]
+    po_lines = [{"quantity": 100 + qty_delta, "price": 50.0} for _ in range(10_000)]
+    assert _compare_lines(invoice_lines, po_lines) is expected
+    monkeypatch.setattr(_match_kernels, "HAVE_NUMBA", False)
+    assert _compare_lines(invoice_lines, po_lines) is expected
+    monkeypatch.setattr(po_lookup, "HAVE_NUMPY", False)
+    assert _compare_lines(invoice_lines, po_lines) is expected
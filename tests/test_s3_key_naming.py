@@ -14,15 +14,31 @@ characters should be normalised to underscores to form valid S3 keys.
 
 import os
 from pathlib import Path
+from unittest.mock import MagicMock
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+import pytest
 
-from invoice_hawk.models import Base
-from invoice_hawk.cli import process_file
+from invoice_hawk.cli import _inv_key, _vendor_key, process_file
 
 
-def test_json_key_naming(tmp_path, monkeypatch):
+@pytest.mark.parametrize(
+    "raw,vendor,invno",
+    [
+        ("Test Vendor/Inc", "Test_Vendor_Inc", "TEST_VENDOR_INC"),
+        ("INV/001", "INV_001", "INV_001"),
+        ("  a \\ b -- c  ", "a_b_c", "A_B_C"),
+        ("Café Ltd", "Caf_Ltd", "CAF_LTD"),
+        (None, "unknown", "UNKNOWN"),
+    ],
+)
+def test_key_sanitizers(raw, vendor, invno):
+    """The key helpers alone, without a database or ``process_file``."""
+    assert _vendor_key(raw) == vendor
+    assert _inv_key(raw) == invno
+
+
+@pytest.mark.slow
+def test_json_key_naming(tmp_path, env, patches, db_session):
     # Create a temporary PDF file
     pdf_path = tmp_path / "inv 001.pdf"
     pdf_path.write_bytes(b"dummy")
@@ -49,32 +65,20 @@ def test_json_key_naming(tmp_path, monkeypatch):
         def get_purchase_order(self, po):  # type: ignore[override]
             return {"lines": [{"quantity": 1, "price": 10.0}]}
 
-    # Capture the uploaded keys
-    uploaded = {"json_key": None, "raw_key": None}
-
-    def fake_upload_file_to_s3(content, bucket, key, content_type):  # type: ignore[override]
-        if content_type == "application/pdf":
-            uploaded["raw_key"] = key
-        else:
-            uploaded["json_key"] = key
-
-    # Set environment variables
-    monkeypatch.setenv("ARCHIVE_BUCKET", "test-bucket")
-    # Replace the upload function
-    monkeypatch.setattr("invoice_hawk.cli.upload_file_to_s3", fake_upload_file_to_s3)
-    # Prepare a SQLite database
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    session = Session(engine)
+    # Spy on the upload hook to capture the keys and content types
+    spy = MagicMock()
+    env(ARCHIVE_BUCKET="test-bucket")
+    patches(**{"invoice_hawk.cli.upload_file_to_s3": spy})
 
     # Run the process_file function
-    process_file(pdf_path, session, DummyProvider(), DummyNS(), slack_webhook=None)
-    session.close()
+    process_file(pdf_path, db_session, DummyProvider(), DummyNS(), slack_webhook=None)
 
-    # Check that both raw and JSON keys were set
-    assert uploaded["raw_key"] is not None
-    assert uploaded["json_key"] is not None
+    # Exactly one raw and one JSON upload, in that order
+    assert [c.args[3] for c in spy.call_args_list] == ["application/pdf", "application/json"]
+    raw_key = spy.call_args_list[0].args[2]
+    json_key = spy.call_args_list[1].args[2]
+    assert raw_key == "raw/2025/07/30/Test_Vendor_Inc/INV_001.pdf"
     # The JSON key should normalise spaces and slashes and match the date
-    assert uploaded["json_key"].startswith("json/2025/07/30/")
-    assert "Test_Vendor_Inc" in uploaded["json_key"]
-    assert uploaded["json_key"].endswith("INV_001.json")
\ No newline at end of file
+    assert json_key.startswith("json/2025/07/30/")
+    assert "Test_Vendor_Inc" in json_key
+    assert json_key.endswith("INV_001.json")
@@ -0,0 +1,254 @@
+"""
+Tests for the Slack interactivity endpoint.
+
+The handler is driven directly with a signed Starlette request so the tests
+do not need an HTTP client; the app lifespan is entered explicitly where the
+background audit writer is under test.
+"""
+
+import asyncio
+import datetime as dt
+import hashlib
+import hmac
+import json
+import time
+from urllib.parse import urlencode
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+from invoice_hawk import slack_app
+from invoice_hawk.models import AuditLog, Base, Invoice
+
+SECRET = "mysecret"
+
+
+@pytest.fixture(autouse=True)
+def _no_form_parser(monkeypatch):
+    """Fail loudly if the handler goes through ``Request.form()``.
+
+    ``form()`` needs the optional python-multipart package; the handler
+    parses the urlencoded body itself, so these tests must pass with or
+    without it installed.
+    """
+
+    async def _form(self, *args, **kwargs):
+        raise AssertionError("slack_actions must not depend on Request.form()")
+
+    monkeypatch.setattr(Request, "form", _form)
+
+
+def _signed_request(invoice_id: int, action_id: str = "approve_invoice", **extra) -> Request:
+    payload = {
+        "actions": [{"action_id": action_id, "value": str(invoice_id)}],
+        "message": {"ts": "123.456"},
+        "channel": {"id": "C1"},
+        **extra,
+    }
+    # Slack sends raw UTF-8 JSON rather than \u escapes.
+    body = urlencode({"payload": json.dumps(payload, ensure_ascii=False)}).encode()
+    timestamp = str(int(time.time()))
+    sig = hmac.new(SECRET.encode(), f"v0:{timestamp}:{body.decode()}".encode(), hashlib.sha256).hexdigest()
+    headers = [
+        (b"content-type", b"application/x-www-form-urlencoded"),
+        (b"x-slack-request-timestamp", timestamp.encode()),
+        (b"x-slack-signature", f"v0={sig}".encode()),
+    ]
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    scope = {"type": "http", "method": "POST", "path": "/slack/actions", "headers": headers, "query_string": b""}
+    return Request(scope, receive)
+
+
+def _setup_db(tmp_path, monkeypatch, n_invoices: int = 1) -> str:
+    db_url = f"sqlite:///{tmp_path / 'slack.db'}"
+    engine = create_engine(db_url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(1, n_invoices + 1):
+            session.add(
+                Invoice(
+                    id=i,
+                    vendor="Acme",
+                    invoice_number=f"INV-{i}",
+                    invoice_date=dt.date(2025, 7, 24),
+                    total=100.0,
+                    purchase_order_number="PO-1",
+                    status="awaiting_approval",
+                )
+            )
+        session.commit()
+    engine.dispose()
+    monkeypatch.setenv("SLACK_SIGNING_SECRET", SECRET)
+    monkeypatch.setenv("DATABASE_URL", db_url)
+    monkeypatch.delenv("SLACK_BOT_TOKEN", raising=False)
+    monkeypatch.delenv("SLACK_WEBHOOK_URL", raising=False)
+    return db_url
+
+
+def _audit_rows(db_url: str):
+    engine = create_engine(db_url)
+    with Session(engine) as session:
+        rows = session.scalars(select(AuditLog).order_by(AuditLog.invoice_id)).all()
+        statuses = session.scalars(select(Invoice.status).order_by(Invoice.id)).all()
+    engine.dispose()
+    return rows, statuses
+
+
+def test_audit_rows_are_batched_by_writer(tmp_path, monkeypatch):
+    db_url = _setup_db(tmp_path, monkeypatch, n_invoices=3)
+
+    async def run():
+        async with slack_app._lifespan(slack_app.app):
+            responses = await asyncio.gather(*(slack_app.slack_actions(_signed_request(i)) for i in (1, 2, 3)))
+        return responses
+
+    responses = asyncio.run(run())
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    rows, statuses = _audit_rows(db_url)
+    assert [r.invoice_id for r in rows] == [1, 2, 3]
+    assert rows[0].details["message_ts"] == "123.456"
+    assert statuses == ["approved"] * 3
+
+
+def test_failed_audit_batch_is_retried(tmp_path, monkeypatch):
+    db_url = _setup_db(tmp_path, monkeypatch, n_invoices=2)
+    write = slack_app._write_audit_rows
+    calls = []
+
+    def flaky_write(session_factory, rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        write(session_factory, rows)
+
+    monkeypatch.setattr(slack_app, "_write_audit_rows", flaky_write)
+
+    async def run():
+        async with slack_app._lifespan(slack_app.app):
+            await asyncio.gather(*(slack_app.slack_actions(_signed_request(i)) for i in (1, 2)))
+
+    asyncio.run(run())
+    rows, _ = _audit_rows(db_url)
+    assert [r.invoice_id for r in rows] == [1, 2]
+    assert calls == [2, 2]
+
+
+def test_audit_row_kept_when_writer_stops_mid_request(tmp_path, monkeypatch):
+    db_url = _setup_db(tmp_path, monkeypatch)
+    apply_action = slack_app._apply_action
+
+    def apply_during_shutdown(*args):
+        # Shutdown clears the queue while the update is on the threadpool.
+        slack_app._audit_queue = None
+        return apply_action(*args)
+
+    monkeypatch.setattr(slack_app, "_apply_action", apply_during_shutdown)
+
+    async def run():
+        async with slack_app._lifespan(slack_app.app):
+            return await slack_app.slack_actions(_signed_request(1))
+
+    assert asyncio.run(run()).status_code == 200
+    rows, statuses = _audit_rows(db_url)
+    assert len(rows) == 1
+    assert statuses == ["approved"]
+
+
+def test_audit_row_written_inline_without_lifespan(tmp_path, monkeypatch):
+    db_url = _setup_db(tmp_path, monkeypatch)
+    response = asyncio.run(slack_app.slack_actions(_signed_request(1, "reject_invoice")))
+    assert response.status_code == 200
+    rows, statuses = _audit_rows(db_url)
+    assert len(rows) == 1
+    assert statuses == ["rejected"]
+
+
+def test_payload_with_non_ascii_text_is_accepted(tmp_path, monkeypatch):
+    """Slack echoes the original message back, including the emoji button labels."""
+    db_url = _setup_db(tmp_path, monkeypatch)
+    request = _signed_request(
+        1,
+        user={"name": "Zoë"},
+        message={"ts": "123.456", "text": "Invoice INV-1", "blocks": [{"text": {"text": "Approve ✅"}}]},
+    )
+    response = asyncio.run(slack_app.slack_actions(request))
+    assert response.status_code == 200
+    rows, statuses = _audit_rows(db_url)
+    assert statuses == ["approved"]
+    assert rows[0].details["message_ts"] == "123.456"
+
+
+def test_handler_issues_two_statements(tmp_path, monkeypatch):
+    db_url = _setup_db(tmp_path, monkeypatch)
+    engine = slack_app._get_engine(db_url)  # schema setup happens here, not in the request
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        response = asyncio.run(slack_app.slack_actions(_signed_request(1)))
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert response.status_code == 200
+    # UPDATE ... RETURNING for the status, then the inline audit INSERT.
+    assert len(statements) == 2
+    assert statements[0].startswith("UPDATE invoices")
+    assert statements[1].startswith("INSERT INTO audit_log")
+
+
+def test_bot_token_updates_original_message(tmp_path, monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    _setup_db(tmp_path, monkeypatch)
+    monkeypatch.setenv("SLACK_BOT_TOKEN", "xoxb-test")
+    sent = []
+
+    def handler(request):
+        sent.append((str(request.url), request.headers["Authorization"], json.loads(request.content)))
+        return httpx.Response(200, json={"ok": True})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        slack_app.httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw)
+    )
+    response = asyncio.run(slack_app.slack_actions(_signed_request(1)))
+    assert response.status_code == 200
+    assert sent == [
+        (
+            slack_app.SLACK_API_URL + "chat.update",
+            "Bearer xoxb-test",
+            {"channel": "C1", "ts": "123.456", "text": "Invoice INV-1 was approved."},
+        )
+    ]
+
+
+def test_update_slack_messages_share_the_lifespan_client(tmp_path, monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    _setup_db(tmp_path, monkeypatch)
+    sent = []
+
+    def handler(request):
+        sent.append(json.loads(request.content)["ts"])
+        return httpx.Response(200, json={"ok": True})
+
+    async def run():
+        async with slack_app._lifespan(slack_app.app):
+            assert slack_app._slack_http is not None
+            await slack_app._slack_http.aclose()
+            slack_app._slack_http = httpx.AsyncClient(
+                base_url=slack_app.SLACK_API_URL, transport=httpx.MockTransport(handler)
+            )
+            updates = [{"channel": "C1", "ts": str(i), "text": "done"} for i in range(3)]
+            responses = await slack_app._update_slack_messages("xoxb-test", updates)
+        assert slack_app._slack_http is None
+        return responses
+
+    responses = asyncio.run(run())
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert sorted(sent) == ["0", "1", "2"]
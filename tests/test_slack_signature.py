@@ -10,52 +10,70 @@ directly for unit testing.
 import hmac
 import hashlib
 import time
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
 
 from invoice_hawk.slack_app import _verify_slack_request
 
+_SECRET = "mysecret"
+_BODY = b"payload=test"
+
+
+@pytest.fixture
+def frozen_time(monkeypatch):
+    """Pin ``time.time()`` so timestamps do not depend on the wall clock."""
+    t = 1_700_000_000
+    monkeypatch.setattr(time, "time", lambda: float(t))
+    return t
+
+
+def _sign(ts: str, body: bytes = _BODY, secret: str = _SECRET) -> str:
+    """The ``X-Slack-Signature`` value Slack would send for ``body`` at ``ts``."""
+    digest = hmac.new(secret.encode(), f"v0:{ts}:".encode() + body, hashlib.sha256).hexdigest()
+    return f"v0={digest}"
+
+
+def _request(ts: str, signature: str) -> SimpleNamespace:
+    # _verify_slack_request only reads ``request.headers``.
+    return SimpleNamespace(headers={"X-Slack-Request-Timestamp": ts, "X-Slack-Signature": signature})
+
+
+def test_verify_slack_signature_valid(frozen_time):
+    ts = str(frozen_time)
+    assert _verify_slack_request(_request(ts, _sign(ts)), _BODY, _SECRET) is True
+
+
+def test_verify_slack_signature_invalid(frozen_time):
+    ts = str(frozen_time)
+    assert _verify_slack_request(_request(ts, "v0=deadbeef"), _BODY, _SECRET) is False
+
+
+def test_verify_slack_signature_malformed(frozen_time):
+    """Signatures that are not ``v0=<hex>`` are rejected, not raised on."""
+    ts = str(frozen_time)
+    for bad in ("v0=not-hex", "v1=deadbeef", ""):
+        assert _verify_slack_request(_request(ts, bad), _BODY, _SECRET) is False
+
+
+def test_verify_slack_signature_old_timestamp(frozen_time):
+    """Requests older than 5 minutes should be rejected."""
+    ts = str(frozen_time - 600)
+    assert _verify_slack_request(_request(ts, _sign(ts)), _BODY, _SECRET) is False
+
+
+def test_verify_large_body_does_not_copy_it(frozen_time):
+    """Verifying a 100 KB body should not allocate copies of the body."""
+    body = b"payload=" + b"x" * 100_000
+    ts = str(frozen_time)
+    request = _request(ts, _sign(ts, body))
+    assert _verify_slack_request(request, body, _SECRET) is True  # warm the HMAC template cache
 
-class DummyRequest:
-    def __init__(self, headers: dict) -> None:
-        self.headers = headers
-
-
-def test_verify_slack_signature_valid():
-    secret = "mysecret"
-    body = b"payload=test"
-    timestamp = str(int(time.time()))
-    basestring = f"v0:{timestamp}:{body.decode()}"
-    sig = hmac.new(secret.encode(), basestring.encode(), hashlib.sha256).hexdigest()
-    headers = {
-        "X-Slack-Request-Timestamp": timestamp,
-        "X-Slack-Signature": f"v0={sig}",
-    }
-    request = DummyRequest(headers)
-    assert _verify_slack_request(request, body, secret) is True
-
-
-def test_verify_slack_signature_invalid():
-    secret = "mysecret"
-    body = b"payload=test"
-    timestamp = str(int(time.time()))
-    headers = {
-        "X-Slack-Request-Timestamp": timestamp,
-        "X-Slack-Signature": "v0=deadbeef",
-    }
-    request = DummyRequest(headers)
-    assert _verify_slack_request(request, body, secret) is False
-
-
-def test_verify_slack_signature_old_timestamp():
-    """Requests older than 5 minutes should be rejected."""
-    secret = "mysecret"
-    body = b"payload=test"
-    # timestamp 10 minutes in the past
-    old_timestamp = str(int(time.time()) - 600)
-    basestring = f"v0:{old_timestamp}:{body.decode()}"
-    sig = hmac.new(secret.encode(), basestring.encode(), hashlib.sha256).hexdigest()
-    headers = {
-        "X-Slack-Request-Timestamp": old_timestamp,
-        "X-Slack-Signature": f"v0={sig}",
-    }
-    request = DummyRequest(headers)
-    assert _verify_slack_request(request, body, secret) is False
\ No newline at end of file
+    tracemalloc.start()
+    try:
+        assert _verify_slack_request(request, body, _SECRET) is True
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < len(body) // 2
@@ -0,0 +1,46 @@
+"""
+Tests for the shared helpers in ``invoice_hawk.utils``.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from invoice_hawk import utils
+
+
+class RecordingS3:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def put_object(self, **kwargs):
+        self.calls.append(("put_object", kwargs["Key"]))
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+        self.calls.append(("upload_fileobj", key))
+        assert fileobj.read() == b"x" * (utils.MULTIPART_THRESHOLD + 1)
+        assert ExtraArgs == {"ContentType": "application/pdf"}
+
+    def upload_file(self, filename, bucket, key, ExtraArgs=None, Config=None):
+        self.calls.append(("upload_file", key))
+
+
+def test_upload_file_to_s3_picks_transfer_by_content(tmp_path):
+    s3 = RecordingS3()
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF")
+    utils.upload_file_to_s3(b"%PDF", "bucket", "small", client=s3)
+    utils.upload_file_to_s3(b"x" * (utils.MULTIPART_THRESHOLD + 1), "bucket", "large", client=s3)
+    utils.upload_file_to_s3(pdf, "bucket", "path", client=s3)
+    assert s3.calls == [("put_object", "small"), ("upload_fileobj", "large"), ("upload_file", "path")]
+
+
+def test_import_does_not_load_boto3_or_requests():
+    """Handlers that never touch S3 or Slack should not pay for those imports."""
+    code = (
+        "import sys, invoice_hawk.utils, invoice_hawk.ocr_provider; "
+        "loaded = {'boto3', 'requests'} & set(sys.modules); "
+        "assert not loaded, loaded"
+    )
+    repo_root = Path(utils.__file__).resolve().parents[1]
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=repo_root)